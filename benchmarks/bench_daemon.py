@@ -0,0 +1,121 @@
+"""Daemon output check: a forwarded lookup must print what the CLI prints in-process.
+
+For every fixture word, renders `define --no-pager WORD` through
+DaemonServer.run_command (plain, and with colour as for a terminal client) and
+compares it with the output of the same command run in a fresh interpreter.
+Fails (exit code 1) if they differ or if the daemon output carries
+cursor-control codes (spinner frames), then reports the time per lookup of a
+warm daemon call and of a cold in-process run.
+
+Fixtures are served from the response cache of a temporary HOME, so no network
+access or API keys are needed.
+
+    python benchmarks/bench_daemon.py [--width N] [--runs N]
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+SRC = ROOT.parent / "src"
+FIXTURES = ROOT / "fixtures"
+
+# Tudo que não é cor (SGR): cursor, limpeza de linha, \r do spinner
+CONTROL_CODES = re.compile(r"\x1b\[(?![0-9;]*m)|\r")
+SGR_CODES = re.compile(r"\x1b\[[0-9;]*m")
+
+IN_PROCESS = "import sys; from define.command import main; sys.argv = ['define'] + sys.argv[1:]; main()"
+
+
+def fixture_words():
+    return sorted(path.stem[len("collegiate_"):] for path in FIXTURES.glob("collegiate_*.json"))
+
+
+def prepare_home(home):
+    """config.toml com chaves fictícias e as fixtures no cache de respostas"""
+    os.environ["HOME"] = str(home)
+    sys.path.insert(0, str(SRC))
+
+    from define.utils import ConfigManager, ResponseCache
+
+    config = ConfigManager()
+    config.set_data_dict({
+        "DICTIONARY KEY": "bench",
+        "THESAURUS KEY": "bench",
+        # Cross-refs fora das fixtures falham na hora e ficam com o próprio texto
+        "Dictionary URL": "http://127.0.0.1:9/collegiate/",
+        "Thesaurus URL": "http://127.0.0.1:9/thesaurus/",
+        "HTTP Retries": 0,
+        "Rate Limit": 0,
+        "Daily Request Limit": 0,
+    })
+    config.write_config()
+
+    cache = ResponseCache.from_config(config)
+    for path in FIXTURES.glob("*.json"):
+        service, word = path.stem.split("_", 1)
+        prefix = "dict_" if service == "collegiate" else "thes_"
+        cache.set(prefix + word, json.loads(path.read_text(encoding="utf-8")))
+
+
+def run_in_process(argv, home, width):
+    env = dict(os.environ, HOME=str(home), COLUMNS=str(width), PYTHONPATH=str(SRC))
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-c", IN_PROCESS, *argv], capture_output=True, text=True,
+                            env=env, check=True)
+    return result.stdout, time.perf_counter() - start
+
+
+def run_daemon(server, argv, width, color, runs):
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        response = server.run_command(argv, width, color)
+        best = min(best, time.perf_counter() - start)
+    return response["output"], best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--width", type=int, default=100, help="Terminal width sent by the client")
+    parser.add_argument("--runs", type=int, default=5, help="Daemon calls per word (best is reported)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as home:
+        prepare_home(home)
+
+        from define.application import Application
+        from define.daemon import DaemonServer
+        server = DaemonServer(Application())
+
+        failures = []
+        print(f"{'word':<10} {'in-process':>12} {'daemon':>10}")
+        for word in fixture_words():
+            argv = ["--no-pager", word]
+            expected, cold = run_in_process(argv, home, args.width)
+            plain, warm = run_daemon(server, argv, args.width, False, args.runs)
+            colored, _ = run_daemon(server, argv, args.width, True, 1)
+
+            if plain != expected:
+                failures.append(f"{word}: daemon output differs from in-process output")
+            if CONTROL_CODES.search(colored):
+                failures.append(f"{word}: daemon output contains cursor-control codes")
+            elif SGR_CODES.sub("", colored) != expected:
+                failures.append(f"{word}: coloured daemon output differs from in-process output")
+
+            print(f"{word:<10} {cold * 1000:9.2f} ms {warm * 1000:7.2f} ms")
+
+    if failures:
+        print("\n".join(f"REGRESSION: {failure}" for failure in failures))
+        sys.exit(1)
+    print("ok: daemon output matches in-process output")
+
+
+if __name__ == "__main__":
+    main()
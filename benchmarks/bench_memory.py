@@ -0,0 +1,137 @@
+"""Memory held by 10k parsed entries: slotted/interned models vs. plain dataclasses.
+
+Parses the collegiate fixtures (re-decoding the JSON every time, as separate
+API responses would be), enriches them with the thesaurus fixtures and keeps
+the resulting Entry objects alive. The same entries are then rebuilt as
+regular __dict__ dataclasses with un-interned word strings, which is how the
+models looked before, and both are measured with tracemalloc.
+
+    python benchmarks/bench_memory.py [--entries N]
+"""
+import argparse
+import gc
+import json
+import sys
+import tracemalloc
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import SimpleNamespace
+from typing import List
+
+ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(ROOT.parent / "src"))
+
+from define.utils import ConfigManager  # noqa: E402
+
+FIXTURES = ROOT / "fixtures"
+
+
+@dataclass
+class PlainPronunciation:
+    text: str
+
+
+@dataclass
+class PlainDefinition:
+    index: int
+    text: str
+    examples: List[str] = field(default_factory=list)
+    synonyms: List[str] = field(default_factory=list)
+    related: List[str] = field(default_factory=list)
+    antonyms: List[str] = field(default_factory=list)
+
+
+@dataclass
+class PlainEntry:
+    headword: str
+    homonym_num: str = ""
+    part_of_speech: str = ""
+    pronunciations: List[PlainPronunciation] = field(default_factory=list)
+    etymology: str = ""
+    definitions: List[PlainDefinition] = field(default_factory=list)
+    short_summary: List[str] = field(default_factory=list)
+    is_main_entry: bool = True
+
+
+def copy_str(text):
+    """Nova cópia da string (o que cada json.loads produz sem interning)"""
+    return (text + ".")[:-1]
+
+
+def to_plain(entry):
+    return PlainEntry(
+        headword=entry.headword,
+        homonym_num=entry.homonym_num,
+        part_of_speech=entry.part_of_speech,
+        pronunciations=[PlainPronunciation(p.text) for p in entry.pronunciations],
+        etymology=entry.etymology,
+        definitions=[PlainDefinition(
+            index=d.index,
+            text=d.text,
+            examples=list(d.examples),
+            synonyms=[copy_str(w) for w in d.synonyms],
+            related=[copy_str(w) for w in d.related],
+            antonyms=[copy_str(w) for w in d.antonyms],
+        ) for d in entry.definitions],
+        short_summary=list(entry.short_summary),
+        is_main_entry=entry.is_main_entry,
+    )
+
+
+def parse_entries(count):
+    config = ConfigManager()
+    config.set_data_dict({"Cache Enabled": False, "Search Index Enabled": False})
+    parent = SimpleNamespace(config=config)
+
+    from define.services import DictionaryService, ThesaurusService
+    dictionary, thesaurus = DictionaryService(parent), ThesaurusService(parent)
+
+    payloads = []
+    for path in sorted(FIXTURES.glob("collegiate_*.json")):
+        word = path.stem[len("collegiate_"):]
+        thes_path = FIXTURES / f"thesaurus_{word}.json"
+        payloads.append((word, path.read_text(encoding="utf-8"),
+                         thes_path.read_text(encoding="utf-8") if thes_path.exists() else None))
+
+    entries = []
+    while len(entries) < count:
+        for word, dict_json, thes_json in payloads:
+            main_entries, sub_entries = dictionary._process_entries(json.loads(dict_json), word)
+            if thes_json:
+                thesaurus.enrich_entries(word, main_entries, raw_data=json.loads(thes_json))
+            entries.extend(main_entries + sub_entries)
+    return entries[:count]
+
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return result, used
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=10_000, help="Number of entries to keep in memory")
+    args = parser.parse_args()
+
+    # Aquece singletons (APIClient, índices...) para não entrarem na medição
+    parse_entries(10)
+
+    _, slotted = measure(lambda: parse_entries(args.entries))
+    _, plain = measure(lambda: [to_plain(e) for e in parse_entries(args.entries)])
+
+    per_10k = 10_000 / args.entries
+    print(f"entries:              {args.entries}")
+    print(f"plain dataclasses:    {plain * per_10k / 2**20:8.2f} MiB per 10k entries")
+    print(f"slotted + interned:   {slotted * per_10k / 2**20:8.2f} MiB per 10k entries")
+    print(f"saved:                {(plain - slotted) * per_10k / 2**20:8.2f} MiB per 10k entries "
+          f"({(plain - slotted) / plain:.0%})")
+
+
+if __name__ == "__main__":
+    main()
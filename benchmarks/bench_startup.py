@@ -0,0 +1,81 @@
+"""Import-time regression check for the `define` entry point.
+
+Runs `define --help` in fresh interpreters and fails (exit code 1) if any
+heavy module is imported on that path, then reports the cumulative import
+time of `define.command` and the wall-clock time of `--help`.
+
+    python benchmarks/bench_startup.py [--runs N]
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+
+# Módulos que não podem ser carregados por --help (nem pela importação do pacote)
+HEAVY_MODULES = ("requests", "rich", "tomli", "tomli_w")
+
+PROBE = """
+import sys
+from define.command import main
+sys.argv = ["define", "--help"]
+try:
+    main()
+except SystemExit:
+    pass
+sys.stderr.write("LOADED=" + ",".join(sorted(m for m in {heavy!r} if m in sys.modules)) + "\\n")
+"""
+
+
+def run_python(*args):
+    env = dict(os.environ, PYTHONPATH=str(SRC))
+    return subprocess.run([sys.executable, *args], capture_output=True, text=True, env=env, check=True)
+
+
+def loaded_heavy_modules():
+    result = run_python("-c", PROBE.format(heavy=HEAVY_MODULES))
+    line = [l for l in result.stderr.splitlines() if l.startswith("LOADED=")][-1]
+    return [m for m in line[len("LOADED="):].split(",") if m]
+
+
+def import_time_us():
+    """Cumulative import time (µs) of define.command, from -X importtime"""
+    result = run_python("-X", "importtime", "-c", "import define.command")
+    for line in result.stderr.splitlines():
+        match = re.match(r"import time:\s+\d+ \|\s+(\d+) \|\s*define$", line)
+        if match:
+            return int(match.group(1))
+    return 0
+
+
+def help_wall_time(runs):
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        run_python("-c", "import sys; from define.command import main; sys.argv=['define','--help']\n"
+                         "try:\n    main()\nexcept SystemExit:\n    pass")
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="Interpreter launches for the wall-clock timing")
+    args = parser.parse_args()
+
+    heavy = loaded_heavy_modules()
+    print(f"import define.command: {import_time_us() / 1000:8.2f} ms")
+    print(f"define --help:         {help_wall_time(args.runs) * 1000:8.2f} ms (best of {args.runs}, incl. interpreter)")
+
+    if heavy:
+        print(f"REGRESSION: --help imported {', '.join(heavy)}")
+        sys.exit(1)
+    print("ok: no heavy modules imported on --help")
+
+
+if __name__ == "__main__":
+    main()
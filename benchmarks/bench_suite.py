@@ -0,0 +1,199 @@
+"""Benchmark suite over the synthetic Merriam-Webster fixtures.
+
+Times each parsing/rendering stage separately on every fixture and writes the
+results as JSON, so runs from different versions can be compared:
+
+    python benchmarks/bench_suite.py --output before.json
+    python benchmarks/bench_suite.py --compare before.json
+
+Stages: DictionaryService._process_entries, ThesaurusService._process_thesaurus_entries,
+ThesaurusService.enrich_entries (a first enrichment: the sense index cache is
+cleared before every call), TextProcessor.clean_text and
+Formatter.format_main_entry (a first render: the render cache is cleared
+before every call), plus "(cached)" variants of the last two stages for calls
+served from those caches.
+No network access is needed: services run without API keys, so cross-refs
+resolve to their own text.
+"""
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(ROOT.parent / "src"))
+
+from define.utils import ConfigManager  # noqa: E402
+
+FIXTURES = ROOT / "fixtures"
+
+
+def load_fixture(name):
+    with open(FIXTURES / f"{name}.json", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def fixture_words():
+    """Words with both a collegiate_<word>.json and a thesaurus_<word>.json"""
+    words = []
+    for path in sorted(FIXTURES.glob("collegiate_*.json")):
+        word = path.stem[len("collegiate_"):]
+        if (FIXTURES / f"thesaurus_{word}.json").exists():
+            words.append(word)
+    return words
+
+
+def markup_strings(node):
+    if isinstance(node, str):
+        if '{' in node:
+            yield node
+    elif isinstance(node, list):
+        for item in node:
+            yield from markup_strings(item)
+    elif isinstance(node, dict):
+        for item in node.values():
+            yield from markup_strings(item)
+
+
+def measure(func, min_time, repeat):
+    """Calibra o número de iterações e devolve (iterações, tempos por operação)"""
+    iterations = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        iterations *= 2
+
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        samples.append((time.perf_counter() - start) / iterations)
+    return iterations, samples
+
+
+def build_services():
+    # Sem chaves de API, sem cache/índice em disco: mede só o processamento
+    config = ConfigManager()
+    config.set_data_dict({"Cache Enabled": False, "Search Index Enabled": False})
+    parent = SimpleNamespace(config=config)
+
+    from define.services import DictionaryService, ThesaurusService
+    return DictionaryService(parent), ThesaurusService(parent)
+
+
+def cases():
+    from define.ui import Formatter
+
+    dictionary, thesaurus = build_services()
+    formatter = Formatter(100)
+
+    for word in fixture_words():
+        raw_dict = load_fixture(f"collegiate_{word}")
+        raw_thes = load_fixture(f"thesaurus_{word}")
+        main_entries, _ = dictionary._process_entries(raw_dict, word)
+        strings = list(markup_strings(raw_dict)) + list(markup_strings(raw_thes))
+
+        def enrich(raw=raw_thes, w=word, e=main_entries):
+            # Primeiro enriquecimento: sem o índice de senses já montado para este raw_thes
+            thesaurus._sense_indexes.clear()
+            thesaurus.enrich_entries(w, e, raw_data=raw)
+
+        def clean_all(strings=strings):
+            for text in strings:
+                dictionary.text_processor.clean_text(text)
+
+        def format_all(entries=main_entries):
+            # Primeira renderização, comparável com versões sem o cache de renderização
+            formatter._render_cache.clear()
+            for entry in entries:
+                formatter.format_main_entry(entry)
+
+        def format_all_cached(entries=main_entries):
+            for entry in entries:
+                formatter.format_main_entry(entry)
+
+        yield "DictionaryService._process_entries", word, \
+            lambda raw=raw_dict, w=word: dictionary._process_entries(raw, w)
+        yield "ThesaurusService._process_thesaurus_entries", word, \
+            lambda raw=raw_thes, w=word: thesaurus._process_thesaurus_entries(raw, w)
+        yield "ThesaurusService.enrich_entries", word, enrich
+        yield "ThesaurusService.enrich_entries (cached)", word, \
+            lambda raw=raw_thes, w=word, e=main_entries: thesaurus.enrich_entries(w, e, raw_data=raw)
+        yield "TextProcessor.clean_text", word, clean_all
+        yield "Formatter.format_main_entry", word, format_all
+        yield "Formatter.format_main_entry (cached)", word, format_all_cached
+
+
+def run(min_time, repeat, only):
+    results = []
+    for name, fixture, func in cases():
+        if only and not any(o in name for o in only):
+            continue
+        iterations, samples = measure(func, min_time, repeat)
+        results.append({
+            "name": name,
+            "fixture": fixture,
+            "iterations": iterations,
+            "repeat": repeat,
+            "best_us": round(min(samples) * 1e6, 3),
+            "median_us": round(statistics.median(samples) * 1e6, 3),
+            "stdev_us": round(statistics.pstdev(samples) * 1e6, 3),
+        })
+        print(f"{name:48} {fixture:8} {results[-1]['median_us']:12.1f} µs", file=sys.stderr)
+
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "results": results,
+    }
+
+
+def compare(current, baseline_path):
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {(r["name"], r["fixture"]): r for r in json.load(f)["results"]}
+
+    print(f"{'stage':48} {'fixture':8} {'before µs':>12} {'after µs':>12} {'ratio':>7}", file=sys.stderr)
+    for result in current["results"]:
+        before = baseline.get((result["name"], result["fixture"]))
+        if before is None:
+            continue
+        ratio = result["median_us"] / before["median_us"] if before["median_us"] else float("nan")
+        print(f"{result['name']:48} {result['fixture']:8} {before['median_us']:12.1f} "
+              f"{result['median_us']:12.1f} {ratio:6.2f}x", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", "-o", help="Write JSON results to this file (default: stdout)")
+    parser.add_argument("--compare", metavar="BASELINE", help="Print ratios against a previous JSON result")
+    parser.add_argument("--min-time", type=float, default=0.05, help="Minimum seconds per timing sample")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing samples per case")
+    parser.add_argument("--only", nargs="*", help="Run only stages whose name contains one of these strings")
+    args = parser.parse_args()
+
+    report = run(args.min_time, args.repeat, args.only)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    elif not args.compare:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    if args.compare:
+        compare(report, args.compare)
+
+
+if __name__ == "__main__":
+    main()
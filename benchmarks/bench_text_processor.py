@@ -0,0 +1,103 @@
+"""Microbenchmark: TextProcessor.clean_text vs. the original regex chain.
+
+Runs both implementations over every markup string found in the synthetic
+Merriam-Webster payloads under benchmarks/fixtures, checks that they produce
+identical output and reports throughput in strings per second.
+
+    python benchmarks/bench_text_processor.py [--repeat N]
+"""
+import argparse
+import json
+import re
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(ROOT.parent / "src"))
+
+from define.utils.text_processor import TextProcessor  # noqa: E402
+
+FIXTURES = ROOT / "fixtures"
+
+
+def legacy_clean_text(processor: TextProcessor, text: str) -> str:
+    """clean_text as it was before the single-pass tokenizer (4 re.sub passes)"""
+    pattern = re.compile(r'\{dxt\|([^}]*)\}')
+    refs = processor._extract_refs(text, pattern)
+    for ref in refs:
+        if ref not in processor._resolved_refs:
+            processor._resolved_refs[ref] = processor._fetch_ref(ref)
+
+    def replacement(match):
+        inner = match.group(1)
+        parts = inner.split('|')
+        if len(parts) > 1:
+            ref_word = parts[1].split(':')[0]
+            return processor._resolved_refs.get(ref_word, ref_word)
+        return inner
+
+    text = pattern.sub(replacement, text)
+    text = re.sub(r'\{d_link\|([^|}]+)\|[^}]*\}', r'\1', text)
+    text = re.sub(r'\{\/?dx[^}]*\}', '', text)
+    text = re.sub(r'\{[^}]*\}', '', text)
+    return text.strip()
+
+
+def load_strings():
+    """Every markup string of every fixture payload, in document order"""
+    def walk(node):
+        if isinstance(node, str):
+            yield node
+        elif isinstance(node, list):
+            for item in node:
+                yield from walk(item)
+        elif isinstance(node, dict):
+            for item in node.values():
+                yield from walk(item)
+
+    strings = []
+    for path in sorted(FIXTURES.glob("*.json")):
+        with open(path, encoding="utf-8") as f:
+            strings.extend(s for s in walk(json.load(f)) if '{' in s)
+    return strings
+
+
+def timed(func, strings, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in strings:
+            func(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20, help="Runs per implementation (best is kept)")
+    args = parser.parse_args()
+
+    strings = load_strings()
+    processor = TextProcessor(None)
+
+    # Pré-resolve refs para medir só o parsing, sem custo de resolver
+    for text in strings:
+        processor.clean_text(text)
+
+    mismatches = [t for t in strings if processor.clean_text(t) != legacy_clean_text(processor, t)]
+    if mismatches:
+        print(f"{len(mismatches)} strings differ, e.g. {mismatches[0]!r}")
+        sys.exit(1)
+
+    legacy = timed(lambda t: legacy_clean_text(processor, t), strings, args.repeat)
+    current = timed(processor.clean_text, strings, args.repeat)
+
+    print(f"strings:   {len(strings)} (output identical)")
+    print(f"legacy:    {legacy * 1000:8.2f} ms  {len(strings) / legacy:12,.0f} strings/s")
+    print(f"tokenizer: {current * 1000:8.2f} ms  {len(strings) / current:12,.0f} strings/s")
+    print(f"speedup:   {legacy / current:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Records raw Merriam-Webster responses as benchmark fixtures.
+
+Uses the API keys from ~/.Define/config.toml and writes
+fixtures/collegiate_<word>.json and fixtures/thesaurus_<word>.json:
+
+    python benchmarks/record_fixtures.py run set cat happy
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(ROOT.parent / "src"))
+
+import requests  # noqa: E402
+
+from define.utils import ConfigManager  # noqa: E402
+
+FIXTURES = ROOT / "fixtures"
+
+SOURCES = {
+    "collegiate": ("Dictionary URL", "DICTIONARY KEY"),
+    "thesaurus": ("Thesaurus URL", "THESAURUS KEY"),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("words", nargs="+", help="Words to record")
+    args = parser.parse_args()
+
+    config = ConfigManager()
+    if config.read_config() is None:
+        sys.exit("Run 'define --configure' first")
+
+    FIXTURES.mkdir(exist_ok=True)
+    for word in args.words:
+        for source, (url_key, api_key) in SOURCES.items():
+            url = f"{config.get_value(url_key)}{word}?key={config.get_value(api_key)}"
+            resp = requests.get(url, timeout=30)
+            resp.raise_for_status()
+
+            path = FIXTURES / f"{source}_{word}.json"
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(resp.json(), f, ensure_ascii=False, separators=(",", ":"))
+            print(f"recorded {path.relative_to(ROOT)}")
+
+
+if __name__ == "__main__":
+    main()
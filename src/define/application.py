@@ -1,28 +1,70 @@
 import argparse
+import sys
+from threading import Lock
 
-from define.services import DictionaryService, ThesaurusService
-from define.ui import UI
-from define.utils import ConfigManager
+from define.utils.config_manager import ConfigManager
 
 
 class Application:
 
     def __init__(self):
-        self.ui = UI(self)
         self.parser = None
+        self.argv = None
         self.args = None
         self.is_configured = False
         self.run_mode = True
         self.config = ConfigManager()
-        self.dictionary = DictionaryService(self)
-        self.thesaurus = ThesaurusService(self)
 
-    def setup(self)->None:
-        if self.config.read_config() is not None:
-            self.is_configured = True
+        # UI e services (rich, requests...) só são importados/criados quando usados
+        self._ui = None
+        self._dictionary = None
+        self._thesaurus = None
+        self._lookup = None
+        self._lazy_lock = Lock()
+
+    @property
+    def ui(self):
+        if self._ui is None:
+            from define.ui import UI
+            self._build_once("_ui", UI)
+        return self._ui
+
+    @property
+    def dictionary(self):
+        if self._dictionary is None:
+            from define.services import DictionaryService
+            self._build_once("_dictionary", DictionaryService)
+        return self._dictionary
+
+    @property
+    def thesaurus(self):
+        if self._thesaurus is None:
+            from define.services import ThesaurusService
+            self._build_once("_thesaurus", ThesaurusService)
+        return self._thesaurus
+
+    @property
+    def lookup(self):
+        if self._lookup is None:
+            from define.services import LookupService
+            self._build_once("_lookup", LookupService)
+        return self._lookup
+
+    def _build_once(self, attr, factory):
+        # Workers do batch podem pedir o mesmo service ao mesmo tempo
+        with self._lazy_lock:
+            if getattr(self, attr) is None:
+                setattr(self, attr, factory(self))
+        return getattr(self, attr)
 
+    def setup(self, argv=None)->None:
+        # Argumentos primeiro: --help sai sem tocar no config
+        self.argv = sys.argv[1:] if argv is None else list(argv)
         self.__validate_args()
 
+        if self.config.read_config() is not None:
+            self.is_configured = True
+
 
     def __validate_args(self):
         self.parser = argparse.ArgumentParser()
@@ -35,19 +77,189 @@ class Application:
         self.parser.add_argument("-t","--thesaurus",action="store_true", help="Shows the thesaurus"
                                                                               " definition")
 
+        self.parser.add_argument("-b","--batch",metavar="FILE", help="Defines every word listed in FILE "
+                                                                    "(one per line, '-' reads stdin)")
+
+        self.parser.add_argument("-w","--workers",type=int,default=None, help="Number of concurrent lookups "
+                                                                              "in batch mode")
+
+        self.parser.add_argument("--on-error",choices=["report","skip","abort"],default="report",
+                                 help="What to do when a word fails in batch mode")
+
+        self.parser.add_argument("--export",choices=["jsonl","csv","sqlite"], help="Writes the results of a word "
+                                                                             "or --batch to a file instead of "
+                                                                             "the terminal")
+
+        self.parser.add_argument("-o","--output",metavar="PATH",default="-", help="Where --export writes "
+                                                                                 "(default: stdout)")
+
+        self.parser.add_argument("--json",action="store_true", help="Prints the results of a word as JSON "
+                                                                    "(no formatting, no pager)")
+
+        self.parser.add_argument("--prefetch",metavar="FILE", help="Fills the local caches with every word "
+                                                                   "listed in FILE, without printing them")
+
+        self.parser.add_argument("-s","--search",metavar="PHRASE", help="Finds words whose cached definitions "
+                                                                       "mention PHRASE (no API calls)")
+
+        self.parser.add_argument("-i","--interactive",action="store_true", help="Starts an interactive session "
+                                                                                "that keeps looking up words")
+
+        self.parser.add_argument("--daemon",action="store_true", help="Runs a background server that keeps "
+                                                                      "lookups warm for later calls")
+
+        self.parser.add_argument("--stop-daemon",action="store_true", help="Stops the background server")
+
+        self.parser.add_argument("--no-pager",action="store_true", help="Prints results as they are ready "
+                                                                        "instead of opening the pager")
+
+        self.parser.add_argument("--timings",action="store_true", help="Prints a per-stage latency breakdown "
+                                                                       "at the end")
+
         self.parser.add_argument("Word", nargs='?', type=str, help="Word to be defined")
 
-        self.args = self.parser.parse_args()
+        self.args = self.parser.parse_args(self.argv)
         if self.args.configure:
             self.run_mode = False
 
         if self.args.configure and self.args.Word:
             self.parser.error("Cannot use --configure with a word")
 
+        if self.args.batch and self.args.Word:
+            self.parser.error("Cannot use --batch with a word")
+
+        if self.args.search is not None and not self.args.search.strip():
+            self.parser.error("--search needs a non-empty phrase")
+
+        if self.args.search and (self.args.Word or self.args.batch or self.args.configure):
+            self.parser.error("Cannot use --search with a word, --batch or --configure")
+
+        if self.args.prefetch and (self.args.Word or self.args.batch or self.args.search or self.args.configure):
+            self.parser.error("Cannot use --prefetch with a word, --batch, --search or --configure")
 
+        if self.args.interactive and (self.args.batch or self.args.search or self.args.prefetch
+                                      or self.args.configure):
+            self.parser.error("Cannot use --interactive with --batch, --search, --prefetch or --configure")
 
+        if (self.args.daemon or self.args.stop_daemon) and (self.args.Word or self.args.batch or self.args.search
+                                                            or self.args.prefetch or self.args.interactive
+                                                            or self.args.configure):
+            self.parser.error("--daemon and --stop-daemon cannot be combined with other modes")
 
+        if self.args.export and not (self.args.Word or self.args.batch):
+            self.parser.error("--export needs a word or --batch")
 
+        if self.args.export and (self.args.search or self.args.prefetch or self.args.interactive
+                                 or self.args.configure):
+            self.parser.error("Cannot use --export with --search, --prefetch, --interactive or --configure")
+
+        if self.args.export == "sqlite" and self.args.output == "-":
+            self.parser.error("--export sqlite needs --output PATH")
+
+        if self.args.json and not self.args.Word:
+            self.parser.error("--json needs a word")
+
+        if self.args.json and (self.args.batch or self.args.export or self.args.interactive or self.args.configure):
+            self.parser.error("Cannot use --json with --batch, --export, --interactive or --configure")
+
+        if self.args.output != "-" and not self.args.export:
+            self.parser.error("--output can only be used with --export")
+
+        if self.args.workers is not None and self.args.workers < 1:
+            self.parser.error("--workers must be at least 1")
+
+
+
+
+
+
+    def get_mode(self) -> str:
+        from define.services.lookup_service import MODE_DICTIONARY, MODE_THESAURUS, MODE_BOTH
+
+        if self.args.dictionary and not self.args.thesaurus:
+            return MODE_DICTIONARY
+        if self.args.thesaurus and not self.args.dictionary:
+            return MODE_THESAURUS
+        return MODE_BOTH
+
+    def get_workers(self) -> int:
+        if self.args.workers is not None:
+            return self.args.workers
+        return int(self.config.get_value("Batch Workers", 4))
+
+    def can_forward(self) -> bool:
+        """Só buscas diretas (com palavra, sem prompts) vão para o daemon"""
+        return bool(self.args.Word) and not (self.args.configure or self.args.batch or self.args.search
+                                             or self.args.prefetch or self.args.export or self.args.interactive
+                                             or self.args.daemon or self.args.stop_daemon or self.args.timings)
+
+    def run_json(self, out=None) -> int:
+        """
+        --json: serializa o resultado dos services direto, sem UI (rich não é importado).
+
+        Returns:
+            Exit status (1 se a palavra não foi encontrada)
+        """
+        from define.export import results_to_json
+
+        out = sys.stdout if out is None else out
+        word = self.args.Word
+        mode = self.get_mode()
+
+        result = self.lookup.lookup(word, mode)
+        suggestions = [] if result else self.lookup.suggest(word, mode)
+
+        out.write(results_to_json(word, mode, result, suggestions) + "\n")
+        out.flush()
+        return 0 if result else 1
 
     def run(self):
-        self.ui.run()
\ No newline at end of file
+        if self.args.daemon:
+            from define.daemon import DaemonServer
+            if not self.is_configured:
+                self.ui.check_configuration()
+            try:
+                DaemonServer(self).serve_forever()
+            except OSError as e:
+                print(f"Cannot start daemon: {e}", file=sys.stderr)
+                exit(1)
+            except KeyboardInterrupt:
+                pass
+            return
+
+        if self.args.stop_daemon:
+            from define.daemon import DaemonClient
+            if not DaemonClient().stop():
+                print("No daemon is running", file=sys.stderr)
+                exit(1)
+            return
+
+        # Daemon rodando: encaminha e usa o processo quente; senão roda aqui mesmo
+        if self.can_forward():
+            from define.daemon import DaemonClient
+            status = DaemonClient().forward(self.argv)
+            if status is not None:
+                exit(status)
+
+        if self.args.json and not self.args.timings:
+            if not self.is_configured:
+                print("Define is not configured yet; run 'define --configure' first", file=sys.stderr)
+                exit(1)
+            exit(self.run_json())
+
+        if not self.args.timings:
+            self.ui.run()
+            return
+
+        from define.utils.timings import Timings
+        Timings().enabled = True
+        try:
+            if self.args.json:
+                status = self.run_json()
+            else:
+                self.ui.run()
+        finally:
+            self.ui.print_timings()
+
+        if self.args.json:
+            exit(status)
\ No newline at end of file
@@ -0,0 +1,184 @@
+import json
+import os
+import socket
+import sys
+from typing import Optional
+
+from define.utils.directory_manager import DirectoryManager
+
+SOCKET_NAME = "define.sock"
+
+
+def get_socket_path():
+    return DirectoryManager.get_config_directory() / SOCKET_NAME
+
+
+def _recv_line(conn: socket.socket) -> bytes:
+    """Lê até o primeiro '\\n' (o protocolo é uma linha JSON por mensagem)"""
+    chunks = []
+    while True:
+        chunk = conn.recv(65536)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        if chunk.endswith(b"\n"):
+            break
+    return b"".join(chunks)
+
+
+class DaemonClient:
+    """Lado do CLI: encaminha a chamada para o daemon, se ele estiver rodando
+
+    Só usa a stdlib leve (socket/json), então o encaminhamento não paga o
+    import de rich/requests nem a construção dos services.
+    """
+
+    def __init__(self, timeout: float = 120.0):
+        self.path = get_socket_path()
+        self.timeout = timeout
+
+    def is_available(self) -> bool:
+        return hasattr(socket, "AF_UNIX") and self.path.exists()
+
+    def request(self, message: dict) -> Optional[dict]:
+        """Envia uma mensagem e devolve a resposta, ou None se não houver daemon"""
+        if not self.is_available():
+            return None
+
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+                conn.settimeout(self.timeout)
+                conn.connect(str(self.path))
+                conn.sendall(json.dumps(message).encode("utf-8") + b"\n")
+                return json.loads(_recv_line(conn))
+        except (OSError, ValueError):
+            return None
+
+    def forward(self, argv) -> Optional[int]:
+        """
+        Executa a linha de comando no daemon e escreve a saída renderizada.
+
+        Returns:
+            Exit status do comando, ou None para executar no próprio processo
+        """
+        try:
+            width, height = os.get_terminal_size(sys.stdout.fileno())
+        except (OSError, ValueError):
+            width, height = 80, 0
+        is_tty = sys.stdout.isatty()
+
+        response = self.request({"argv": list(argv), "width": width, "color": is_tty})
+        if not response or "status" not in response:
+            return None
+
+        output = response.get("output", "")
+        if is_tty and response.get("pager", True) and output.count("\n") > height:
+            import pydoc
+            pydoc.pager(output)
+        else:
+            sys.stdout.write(output)
+            sys.stdout.flush()
+
+        return response["status"]
+
+    def stop(self) -> bool:
+        response = self.request({"command": "stop"})
+        return bool(response and response.get("stopped"))
+
+
+class DaemonServer:
+    """Processo de longa duração com Application e services quentes
+
+    Atende uma requisição por vez pelo Unix socket em ~/.Define/define.sock:
+    cada requisição traz o argv do CLI e a largura do terminal, e recebe de
+    volta a saída já renderizada pela UI.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.path = get_socket_path()
+        self._running = False
+
+    def serve_forever(self) -> None:
+        if not hasattr(socket, "AF_UNIX"):
+            raise OSError("Unix domain sockets are not supported on this platform")
+
+        if DaemonClient().request({"command": "ping"}) is not None:
+            raise OSError(f"A daemon is already listening on {self.path}")
+
+        # Socket órfão de um daemon que morreu
+        if self.path.exists():
+            self.path.unlink()
+
+        old_umask = os.umask(0o077)
+        try:
+            server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            server.bind(str(self.path))
+        finally:
+            os.umask(old_umask)
+
+        self._running = True
+        try:
+            server.listen()
+            while self._running:
+                conn, _ = server.accept()
+                with conn:
+                    self._handle(conn)
+        finally:
+            server.close()
+            if self.path.exists():
+                self.path.unlink()
+
+    def _handle(self, conn: socket.socket) -> None:
+        try:
+            message = json.loads(_recv_line(conn))
+        except (OSError, ValueError):
+            return
+
+        if not isinstance(message, dict):
+            return
+
+        command = message.get("command")
+        if command == "ping":
+            response = {"pong": True}
+        elif command == "stop":
+            self._running = False
+            response = {"stopped": True}
+        else:
+            response = self.run_command(message.get("argv", []), int(message.get("width", 80)),
+                                        bool(message.get("color", False)))
+
+        try:
+            conn.sendall(json.dumps(response).encode("utf-8") + b"\n")
+        except OSError:
+            return
+
+    def run_command(self, argv, width: int, color: bool) -> dict:
+        """Roda a UI (ou o --json) com os args do cliente, capturando a saída renderizada"""
+        import io
+        from rich.console import Console
+        from define.ui import UI
+
+        # Cores sim, mas não interativo: o spinner do console.status não pode ir parar no buffer
+        buffer = io.StringIO()
+        console = Console(file=buffer, width=width, force_terminal=color, force_interactive=False,
+                          color_system="standard" if color else None)
+
+        status = 0
+        pager = True
+        try:
+            self.app.setup(argv)
+            # O cliente decide o pager como UI.should_page(): nunca com --no-pager,
+            # nem para JSON, que é para scripts e sai como está
+            pager = not (self.app.args.no_pager or self.app.args.json)
+            if self.app.args.json:
+                status = self.app.run_json(buffer)
+            else:
+                UI(self.app, console=console, use_pager=False).run()
+        except SystemExit as e:
+            status = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+        except Exception as e:
+            console.print(f"[bold red]Error: {e}[/bold red]")
+            status = 1
+
+        return {"status": status, "output": buffer.getvalue(), "pager": pager}
@@ -0,0 +1,148 @@
+import csv
+import json
+import sqlite3
+import sys
+from dataclasses import asdict
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from define.models import Entry
+
+EXPORT_FORMATS = ("jsonl", "csv", "sqlite")
+
+# Uma linha por definição (CSV/SQLite); entradas sem definição geram uma linha só, com o resumo
+COLUMNS = ("word", "headword", "homonym", "part_of_speech", "is_main_entry", "pronunciations", "etymology",
+           "definition_index", "definition", "examples", "synonyms", "related", "antonyms")
+
+LIST_SEPARATOR = "; "
+
+
+def entry_to_dict(entry: Entry) -> Dict:
+    """Entry -> dict (dataclasses.asdict), com syn/rel/ant em ordem alfabética"""
+    data = asdict(entry)
+    for definition in data["definitions"]:
+        for key in ("synonyms", "related", "antonyms"):
+            definition[key] = sorted(set(definition[key]))
+    return data
+
+
+def results_to_json(word: str, mode: str, entries: Optional[Tuple[List[Entry], List[Entry]]],
+                    suggestions: Iterable[str] = ()) -> str:
+    """Resultado de um lookup (a tupla dos services) como um objeto JSON numa linha (--json)"""
+    main_entries, sub_entries = entries if entries else ([], [])
+    return json.dumps({
+        "word": word,
+        "mode": mode,
+        "found": bool(entries),
+        "main_entries": [entry_to_dict(entry) for entry in main_entries],
+        "sub_entries": [entry_to_dict(entry) for entry in sub_entries],
+        "suggestions": list(suggestions),
+    }, ensure_ascii=False)
+
+
+def iter_entries(entries: Tuple[List[Entry], List[Entry]]) -> Iterator[Entry]:
+    """Entradas principais e depois sub-entradas (ordem de exibição)"""
+    main_entries, sub_entries = entries
+    yield from main_entries
+    yield from sub_entries
+
+
+def iter_rows(word: str, entries: Tuple[List[Entry], List[Entry]]) -> Iterator[Tuple]:
+    """Achata as entradas de uma palavra em linhas com as COLUMNS"""
+    for entry in iter_entries(entries):
+        base = (
+            word,
+            entry.headword,
+            str(entry.homonym_num),
+            entry.part_of_speech,
+            entry.is_main_entry,
+            LIST_SEPARATOR.join(p.text for p in entry.pronunciations),
+            entry.etymology,
+        )
+
+        # Sub-entradas costumam ter só o resumo (shortdef), que vira a definição
+        if not entry.definitions:
+            yield base + (None, LIST_SEPARATOR.join(entry.short_summary), "", "", "", "")
+            continue
+
+        for definition in entry.definitions:
+            yield base + (
+                definition.index,
+                definition.text,
+                LIST_SEPARATOR.join(definition.examples),
+                LIST_SEPARATOR.join(sorted(set(definition.synonyms))),
+                LIST_SEPARATOR.join(sorted(set(definition.related))),
+                LIST_SEPARATOR.join(sorted(set(definition.antonyms))),
+            )
+
+
+class JSONLWriter:
+    """Uma linha JSON por entrada: {"word": ..., <campos da Entry>}"""
+
+    def __init__(self, output: str):
+        self._file = sys.stdout if output == "-" else open(output, "w", encoding="utf-8")
+
+    def write(self, word: str, entries: Tuple[List[Entry], List[Entry]]) -> None:
+        for entry in iter_entries(entries):
+            self._file.write(json.dumps({"word": word, **entry_to_dict(entry)}, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        if self._file is not sys.stdout:
+            self._file.close()
+
+
+class CSVWriter:
+    """CSV com cabeçalho e uma linha por definição"""
+
+    def __init__(self, output: str):
+        self._file = sys.stdout if output == "-" else open(output, "w", encoding="utf-8", newline="")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(COLUMNS)
+
+    def write(self, word: str, entries: Tuple[List[Entry], List[Entry]]) -> None:
+        self._writer.writerows(iter_rows(word, entries))
+        self._file.flush()
+
+    def close(self) -> None:
+        if self._file is not sys.stdout:
+            self._file.close()
+
+
+class SQLiteWriter:
+    """Tabela `definitions` (uma linha por definição), com commit a cada palavra"""
+
+    TABLE = "definitions"
+
+    def __init__(self, output: str):
+        if output == "-":
+            raise ValueError("SQLite export needs a file path (--output PATH)")
+
+        self._conn = sqlite3.connect(output)
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.TABLE} ("
+            f"word TEXT, headword TEXT, homonym TEXT, part_of_speech TEXT, is_main_entry INTEGER, "
+            f"pronunciations TEXT, etymology TEXT, definition_index INTEGER, definition TEXT, examples TEXT, "
+            f"synonyms TEXT, related TEXT, antonyms TEXT)"
+        )
+        self._insert = (f"INSERT INTO {self.TABLE} ({', '.join(COLUMNS)}) "
+                        f"VALUES ({', '.join('?' * len(COLUMNS))})")
+
+    def write(self, word: str, entries: Tuple[List[Entry], List[Entry]]) -> None:
+        with self._conn:
+            self._conn.executemany(self._insert, iter_rows(word, entries))
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+WRITERS = {"jsonl": JSONLWriter, "csv": CSVWriter, "sqlite": SQLiteWriter}
+
+
+def open_writer(export_format: str, output: str):
+    """
+    Abre o writer do formato pedido.
+
+    Cada write() grava (e descarrega) todas as linhas de uma palavra, então
+    uma exportação interrompida mantém as palavras já concluídas.
+    """
+    return WRITERS[export_format](output)
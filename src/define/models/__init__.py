@@ -1,5 +1,6 @@
 from define.models.pronunciation import Pronunciation
 from define.models.definition import Definition
 from define.models.entry import Entry
+from define.models.lookup_result import LookupResult
 
-__all__ = ["Pronunciation", "Definition","Entry"]
\ No newline at end of file
+__all__ = ["Pronunciation", "Definition","Entry","LookupResult"]
\ No newline at end of file
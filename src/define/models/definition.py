@@ -2,7 +2,7 @@ from dataclasses import field, dataclass
 from typing import List
 
 
-@dataclass
+@dataclass(slots=True)
 class Definition:
     index: int
     text: str
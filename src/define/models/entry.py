@@ -3,7 +3,7 @@ from typing import List
 
 from define.models import Definition, Pronunciation
 
-@dataclass
+@dataclass(slots=True)
 class Entry:
 
     headword: str
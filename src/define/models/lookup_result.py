@@ -0,0 +1,15 @@
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from define.models import Entry
+
+
+@dataclass(slots=True)
+class LookupResult:
+    word: str
+    entries: Optional[Tuple[List[Entry], List[Entry]]] = None
+    error: Optional[Exception] = None
+
+    @property
+    def failed(self) -> bool:
+        return self.error is not None or not self.entries
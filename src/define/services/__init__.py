@@ -1,4 +1,8 @@
 from define.services.dictionary_service import DictionaryService
 from define.services.thesaurus_service import ThesaurusService
+from define.services.lookup_service import LookupService, MODE_DICTIONARY, MODE_THESAURUS, MODE_BOTH, \
+    PARSER_VERSION, PREFETCH_HIT, PREFETCH_MISS, PREFETCH_NOT_FOUND, PREFETCH_FAILED
 
-__all__ = ["DictionaryService", "ThesaurusService"]
\ No newline at end of file
+__all__ = ["DictionaryService", "ThesaurusService", "LookupService", "MODE_DICTIONARY", "MODE_THESAURUS",
+           "MODE_BOTH", "PARSER_VERSION", "PREFETCH_HIT", "PREFETCH_MISS", "PREFETCH_NOT_FOUND",
+           "PREFETCH_FAILED"]
\ No newline at end of file
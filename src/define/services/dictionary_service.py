@@ -1,6 +1,8 @@
-from typing import List, Dict, Optional, Tuple
+import sys
+from typing import List, Dict, Optional, Tuple, Iterator
 
-from define.utils import ServiceBase, APIClient, TextProcessor
+from define.utils import ServiceBase, APIClient, RefStore, TextProcessor, SearchIndex, Vocabulary, Timings, \
+    PRIORITY_USER, PRIORITY_BACKGROUND
 from define.models import Entry, Definition, Pronunciation
 
 
@@ -10,13 +12,29 @@ class DictionaryService(ServiceBase):
     def __init__(self, parent):
         super().__init__(parent)
         self.api_client = APIClient()
-        self.text_processor = TextProcessor(self.api_client)
+        self.text_processor = TextProcessor(self.api_client, ref_store=RefStore(), namespace="dict")
+        self.search_index = SearchIndex()
+        self.vocabulary = Vocabulary()
+        self.timings = Timings()
 
         # Injeta resolver de refs que usa este service
         self.text_processor.set_ref_resolver(self._resolve_ref)
 
-    def fetch_and_process(self, word: str) -> Optional[Tuple[List[Entry], List[Entry]]]:
+    def fetch_and_process(self, word: str,
+                          priority: int = PRIORITY_USER) -> Optional[Tuple[List[Entry], List[Entry]]]:
         """Busca e processa palavra no dicionário"""
+        # Busca dados
+        raw_data = self.fetch_raw(word, priority)
+
+        if not raw_data or not any(isinstance(e, dict) for e in raw_data):
+            return None
+
+        # Processa entradas
+        with self.timings.stage("dictionary parsing"):
+            return self._process_entries(raw_data, word)
+
+    def fetch_raw(self, word: str, priority: int = PRIORITY_USER) -> Optional[List[Dict]]:
+        """Busca os dados brutos do dicionário sem processá-los"""
         # Pega config
         config = self._ServiceBase__parent.config
         dict_key = config.get_data("DICTIONARY KEY")
@@ -28,43 +46,58 @@ class DictionaryService(ServiceBase):
         # Monta URL
         url = f"{dict_url[list(dict_url.keys())[0]]}{word}?key={dict_key[list(dict_key.keys())[0]]}"
 
-        # Busca dados
-        raw_data = self.api_client.fetch(url, f"dict_{word}")
+        return self.api_client.fetch(url, f"dict_{word}", priority=priority)
 
-        if not raw_data or not any(isinstance(e, dict) for e in raw_data):
-            return None
+    def has_recent_failure(self, word: str) -> bool:
+        """Indica se o último fetch da palavra falhou por erro transitório"""
+        return self.api_client.has_recent_failure(f"dict_{word}")
 
-        # Processa entradas
-        return self._process_entries(raw_data, word)
+    def get_suggestions(self, word: str) -> List[str]:
+        """Sugestões da API para uma palavra que não foi encontrada (sem novo GET)"""
+        return self.api_client.get_suggestions(f"dict_{word}")
+
+    def iter_entries(self, raw_data: List[Dict], query_word: str) -> Iterator[Entry]:
+        """Processa e entrega uma Entry por vez: principais primeiro, depois sub-entradas"""
+        # Resolve todas as cross-refs de uma vez, em paralelo, antes dos senses
+        self.text_processor.prefetch_refs(self._iter_texts(raw_data))
+
+        raw_entries = [entry for entry in raw_data if isinstance(entry, dict)]
+        ordered = [entry for entry in raw_entries if self._is_main_entry(entry, query_word)]
+        ordered += [entry for entry in raw_entries if not self._is_main_entry(entry, query_word)]
+
+        processed = []
+        for entry in ordered:
+            processed.append(self._process_entry(entry, query_word))
+            yield processed[-1]
 
-    def _resolve_ref(self, ref_word: str) -> str:
-        """Resolve cross-reference buscando na API"""
+        # Alimenta o índice full-text usado por --search e as sugestões de grafia
+        self.search_index.index_entries(processed)
+        self.vocabulary.add_raw_entries(raw_entries)
+
+    def _resolve_ref(self, ref_word: str) -> Optional[str]:
+        """Resolve cross-reference buscando na API (None se não conseguir)"""
         config = self._ServiceBase__parent.config
         dict_key = config.get_data("DICTIONARY KEY")
         dict_url = config.get_data("Dictionary URL")
 
         if not dict_key or not dict_url:
-            return ref_word
+            return None
 
         url = f"{dict_url[list(dict_url.keys())[0]]}{ref_word}?key={dict_key[list(dict_key.keys())[0]]}"
-        entries = self.api_client.fetch(url, f"dict_{ref_word}")
+        # Cross-refs são trabalho de fundo: cedem a vez (e a cota) aos lookups do usuário
+        entries = self.api_client.fetch(url, f"dict_{ref_word}", priority=PRIORITY_BACKGROUND)
 
         if entries and isinstance(entries, list) and entries and isinstance(entries[0], dict):
             return entries[0].get('hwi', {}).get('hw', ref_word).replace('*', '')
 
-        return ref_word
+        return None
 
     def _process_entries(self, raw_data: List[Dict], query_word: str) -> Tuple[List[Entry], List[Entry]]:
         """Separa e processa entradas principais e sub-entradas"""
         main_entries = []
         sub_entries = []
 
-        for entry in raw_data:
-            if not isinstance(entry, dict):
-                continue
-
-            processed = self._process_entry(entry, query_word)
-
+        for processed in self.iter_entries(raw_data, query_word):
             if processed.is_main_entry:
                 main_entries.append(processed)
             else:
@@ -72,10 +105,44 @@ class DictionaryService(ServiceBase):
 
         return main_entries, sub_entries
 
+    def _iter_texts(self, raw_data: List[Dict]) -> Iterator[str]:
+        """Percorre os mesmos textos que passam por clean_text (et, dt, vis, sdsense, shortdef)"""
+        for entry in raw_data:
+            if not isinstance(entry, dict):
+                continue
+
+            for seg in entry.get('et', []):
+                if seg[0] == 'text':
+                    yield seg[1]
+
+            for def_block in entry.get('def', []):
+                for sseq_block in def_block.get('sseq', []):
+                    for sense_tuple in sseq_block:
+                        if sense_tuple[0] != 'sense':
+                            continue
+
+                        for dt_item in sense_tuple[1].get('dt', []):
+                            kind, content = dt_item[0], dt_item[1]
+                            if kind == 'text':
+                                yield content
+                            elif kind == 'vis':
+                                for vis in content:
+                                    yield vis.get('t', '')
+                            elif kind == 'sdsense':
+                                for sub_dt in content.get('dt', []):
+                                    if sub_dt[0] == 'text':
+                                        yield sub_dt[1]
+
+            yield from entry.get('shortdef', [])
+
+    def _is_main_entry(self, entry: Dict, query_word: str) -> bool:
+        """Entrada principal = headword igual à palavra buscada"""
+        hwi_hw = entry.get('hwi', {}).get('hw', '').lower().replace('*', '')
+        return hwi_hw == query_word.lower()
+
     def _process_entry(self, entry: Dict, query_word: str) -> Entry:
         """Processa uma entrada completa"""
-        hwi_hw = entry.get('hwi', {}).get('hw', '').lower().replace('*', '')
-        is_main = hwi_hw == query_word.lower()
+        is_main = self._is_main_entry(entry, query_word)
 
         return Entry(
             headword=entry.get('hwi', {}).get('hw', '').replace('*', ''),
@@ -203,7 +270,8 @@ class DictionaryService(ServiceBase):
         for group in groups:
             for wdobj in group:
                 if isinstance(wdobj, dict) and "wd" in wdobj:
-                    words.append(wdobj["wd"])
+                    # As mesmas palavras se repetem em milhares de definições
+                    words.append(sys.intern(wdobj["wd"]))
 
         return words
 
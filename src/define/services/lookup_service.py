@@ -0,0 +1,314 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+from define.utils import ServiceBase, EntryCache, SpellIndex, Timings, PRIORITY_USER, PRIORITY_BACKGROUND
+from define.models import Entry, LookupResult
+
+MODE_DICTIONARY = "dictionary"
+MODE_THESAURUS = "thesaurus"
+MODE_BOTH = "both"
+
+# Versão do parsing/enriquecimento e dos models: incrementar sempre que a saída
+# de lookup() mudar, para invalidar o EntryCache
+PARSER_VERSION = 1
+
+# Resultado de cada palavra no --prefetch
+PREFETCH_HIT = "hit"              # já estava no cache
+PREFETCH_MISS = "miss"            # buscada/processada agora
+PREFETCH_NOT_FOUND = "not found"  # a API respondeu que não existe
+PREFETCH_FAILED = "failed"        # erro ou falha transitória (tentar de novo depois)
+
+T = TypeVar("T")
+
+
+class LookupService(ServiceBase):
+    """Orquestra dicionário + thesaurus para uma ou várias palavras"""
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.timings = Timings()
+        self._entry_cache: Optional[EntryCache] = None
+        self._entry_cache_loaded = False
+        self._init_lock = Lock()
+
+    # ========== PUBLIC METHODS ==========
+
+    def lookup(self, word: str, mode: str = MODE_BOTH,
+               priority: int = PRIORITY_USER) -> Optional[Tuple[List[Entry], List[Entry]]]:
+        """
+        Busca uma palavra conforme o modo (-d, -t ou ambos).
+
+        Args:
+            word: Palavra a buscar
+            mode: MODE_DICTIONARY, MODE_THESAURUS ou MODE_BOTH
+            priority: Prioridade dos GETs no QuotaScheduler
+
+        Returns:
+            Tuple com (main_entries, sub_entries) ou None se não encontrar
+        """
+        with self.timings.stage("lookup (total)"):
+            cached = self._get_cached(word, mode)
+            if cached is not None:
+                return cached
+
+            result = self._lookup(word, mode, priority)
+            if result:
+                self._store(word, mode, result)
+            return result
+
+    def _lookup(self, word: str, mode: str,
+                priority: int = PRIORITY_USER) -> Optional[Tuple[List[Entry], List[Entry]]]:
+        """Despacha a busca para dicionário e/ou thesaurus"""
+        parent = self._ServiceBase__parent
+
+        # 🎯 FLUXO 1: Apenas Dicionário (-d)
+        if mode == MODE_DICTIONARY:
+            return parent.dictionary.fetch_and_process(word, priority)
+
+        # 🎯 FLUXO 2: Apenas Thesaurus (-t)
+        if mode == MODE_THESAURUS:
+            return parent.thesaurus.fetch_and_process(word, priority)
+
+        # 🎯 FLUXO 3: Ambos (default, sem flags)
+        # O GET do thesaurus não depende do dicionário: dispara os dois juntos
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="define-thesaurus") as pool:
+            thes_future = pool.submit(parent.thesaurus.fetch_raw, word, priority)
+            dict_result = parent.dictionary.fetch_and_process(word, priority)
+            thes_data = thes_future.result()
+
+        if not dict_result:
+            return None
+
+        main_entries, sub_entries = dict_result
+        parent.thesaurus.enrich_entries(word, main_entries, raw_data=thes_data)
+        return main_entries, sub_entries
+
+    def iter_lookup(self, word: str, mode: str = MODE_BOTH) -> Iterator[Entry]:
+        """
+        Versão streaming de lookup(): entrega cada Entry assim que fica pronta.
+
+        Entradas principais vêm primeiro (já enriquecidas no modo default),
+        depois as sub-entradas. Não entrega nada se a palavra não existir.
+
+        Args:
+            word: Palavra a buscar
+            mode: MODE_DICTIONARY, MODE_THESAURUS ou MODE_BOTH
+
+        Yields:
+            Entry objects na ordem de exibição
+        """
+        # Mesmo estágio de lookup(), sem contar o tempo de quem consome (renderização)
+        yield from self.timings.iter_stage("lookup (total)", self._iter_cached_lookup(word, mode))
+
+    def _iter_cached_lookup(self, word: str, mode: str) -> Iterator[Entry]:
+        """iter_lookup() com EntryCache: serve do cache ou processa e guarda no fim"""
+        cached = self._get_cached(word, mode)
+        if cached is not None:
+            main_entries, sub_entries = cached
+            yield from main_entries
+            yield from sub_entries
+            return
+
+        main_entries, sub_entries = [], []
+        for entry in self._iter_lookup(word, mode):
+            (main_entries if entry.is_main_entry else sub_entries).append(entry)
+            yield entry
+
+        if main_entries or sub_entries:
+            self._store(word, mode, (main_entries, sub_entries))
+
+    def _iter_lookup(self, word: str, mode: str) -> Iterator[Entry]:
+        """Processa e entrega as entradas conforme o modo (sem EntryCache)"""
+        parent = self._ServiceBase__parent
+
+        if mode == MODE_DICTIONARY:
+            raw_data = parent.dictionary.fetch_raw(word)
+            if self._has_entries(raw_data):
+                yield from self.timings.iter_stage("dictionary parsing",
+                                                   parent.dictionary.iter_entries(raw_data, word))
+            return
+
+        if mode == MODE_THESAURUS:
+            raw_data = parent.thesaurus.fetch_raw(word)
+            if self._has_entries(raw_data):
+                yield from self.timings.iter_stage("thesaurus parsing",
+                                                   parent.thesaurus.iter_entries(raw_data, word))
+            return
+
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="define-thesaurus") as pool:
+            thes_future = pool.submit(parent.thesaurus.fetch_raw, word)
+            raw_data = parent.dictionary.fetch_raw(word)
+
+            if not self._has_entries(raw_data):
+                return
+
+            for entry in self.timings.iter_stage("dictionary parsing",
+                                                 parent.dictionary.iter_entries(raw_data, word)):
+                if entry.is_main_entry:
+                    parent.thesaurus.enrich_entries(word, [entry], raw_data=thes_future.result())
+                yield entry
+
+    def suggest(self, word: str, mode: str = MODE_BOTH, limit: int = 5) -> List[str]:
+        """
+        Sugestões "did you mean" para uma palavra sem resultados.
+
+        Junta as sugestões que a API devolveu (já em cache, sem novo GET) com
+        as palavras conhecidas mais próximas no SpellIndex local, que também
+        responde quando a API está fora do ar ou sem cota.
+
+        Args:
+            word: Palavra que não foi encontrada
+            mode: Modo da busca (define se vale a sugestão do dicionário ou do thesaurus)
+            limit: Máximo de sugestões
+
+        Returns:
+            Sugestões, as da API primeiro
+        """
+        parent = self._ServiceBase__parent
+        service = parent.thesaurus if mode == MODE_THESAURUS else parent.dictionary
+
+        spell_index = SpellIndex()
+        api_suggestions = service.get_suggestions(word)
+        spell_index.vocabulary.add_words(api_suggestions)
+
+        suggestions = []
+        for candidate in api_suggestions + spell_index.suggest(word, limit=limit):
+            if candidate.lower() != word.lower() and candidate not in suggestions:
+                suggestions.append(candidate)
+        return suggestions[:limit]
+
+    def has_recent_failure(self, word: str, mode: str = MODE_BOTH) -> bool:
+        """
+        Indica se a última busca da palavra falhou por erro transitório.
+
+        Cache negativo ou circuito aberto: a palavra pode existir, só não foi
+        possível buscá-la agora (diferente de "sem resultados").
+
+        Args:
+            word: Palavra buscada
+            mode: Modo da busca (o thesaurus só decide no modo -t)
+        """
+        parent = self._ServiceBase__parent
+        service = parent.thesaurus if mode == MODE_THESAURUS else parent.dictionary
+        return service.has_recent_failure(word)
+
+    def lookup_many(self, words: Iterable[str], mode: str = MODE_BOTH,
+                    workers: int = 4) -> Iterator[LookupResult]:
+        """
+        Busca várias palavras num pool limitado, preservando a ordem de entrada.
+
+        No máximo `workers * 2` buscas ficam em voo, então a memória não cresce
+        com o tamanho da lista. Erros são capturados por palavra no LookupResult.
+
+        Args:
+            words: Palavras a buscar (pode ser um gerador)
+            mode: Modo de busca (ver lookup())
+            workers: Largura do pool de threads
+
+        Yields:
+            LookupResult de cada palavra, na ordem de entrada
+        """
+        yield from self._map_ordered(lambda word: self._safe_lookup(word, mode), words, workers)
+
+    def prefetch_many(self, words: Iterable[str], mode: str = MODE_BOTH,
+                      workers: int = 4) -> Iterator[Tuple[str, str]]:
+        """
+        Aquece os caches (respostas, cross-refs, entries) para várias palavras.
+
+        Usa o mesmo pool limitado de lookup_many(), mas com prioridade de fundo
+        no QuotaScheduler, e não guarda as entradas processadas na memória.
+
+        Args:
+            words: Palavras a buscar (pode ser um gerador)
+            mode: Modo de busca (ver lookup())
+            workers: Largura do pool de threads
+
+        Yields:
+            (palavra, PREFETCH_HIT/MISS/NOT_FOUND/FAILED), na ordem de entrada
+        """
+        yield from self._map_ordered(lambda word: (word, self._prefetch(word, mode)), words, workers)
+
+    # ========== PRIVATE METHODS ==========
+
+    def _get_entry_cache(self) -> Optional[EntryCache]:
+        """Abre o cache de entries sob demanda conforme o config.toml"""
+        with self._init_lock:
+            if not self._entry_cache_loaded:
+                self._entry_cache = EntryCache.from_config(self._ServiceBase__parent.config)
+                self._entry_cache_loaded = True
+        return self._entry_cache
+
+    def _cache_key(self, word: str, mode: str) -> str:
+        return f"v{PARSER_VERSION}|{mode}|{word}"
+
+    def _get_cached(self, word: str, mode: str) -> Optional[Tuple[List[Entry], List[Entry]]]:
+        cache = self._get_entry_cache()
+        if cache is None:
+            return None
+
+        cached = cache.get(self._cache_key(word, mode))
+        if cached is not None:
+            self.timings.count("cache hits (entries)")
+        return cached
+
+    def _store(self, word: str, mode: str, result: Tuple[List[Entry], List[Entry]]) -> None:
+        cache = self._get_entry_cache()
+        if cache is None:
+            return
+
+        # Sem enriquecimento por falha temporária do thesaurus: não congela o resultado parcial
+        if mode == MODE_BOTH and self._ServiceBase__parent.thesaurus.has_recent_failure(word):
+            return
+
+        cache.set(self._cache_key(word, mode), result)
+
+    def _has_entries(self, raw_data) -> bool:
+        return bool(raw_data) and any(isinstance(e, dict) for e in raw_data)
+
+    def _map_ordered(self, func: Callable[[str], T], words: Iterable[str], workers: int) -> Iterator[T]:
+        """
+        Aplica func a cada palavra num pool limitado, preservando a ordem de entrada.
+
+        No máximo `workers * 2` chamadas ficam em voo, então a memória não
+        cresce com o tamanho da lista.
+        """
+        workers = max(1, workers)
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="define-batch")
+        pending = deque()
+
+        try:
+            for word in words:
+                pending.append(executor.submit(func, word))
+                if len(pending) >= workers * 2:
+                    yield pending.popleft().result()
+
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _prefetch(self, word: str, mode: str) -> str:
+        """Garante a palavra no cache e classifica o resultado"""
+        try:
+            if self._get_cached(word, mode) is not None:
+                return PREFETCH_HIT
+
+            if self.lookup(word, mode, priority=PRIORITY_BACKGROUND):
+                # Dicionário ok mas thesaurus com falha transitória: o resultado não
+                # enriquecido não vai para o cache (_store), então a palavra não está pronta
+                if mode == MODE_BOTH and self._ServiceBase__parent.thesaurus.has_recent_failure(word):
+                    return PREFETCH_FAILED
+                return PREFETCH_MISS
+        except Exception:
+            return PREFETCH_FAILED
+
+        return PREFETCH_FAILED if self.has_recent_failure(word, mode) else PREFETCH_NOT_FOUND
+
+    def _safe_lookup(self, word: str, mode: str) -> LookupResult:
+        """Executa lookup() isolando erros da palavra"""
+        try:
+            return LookupResult(word=word, entries=self.lookup(word, mode))
+        except Exception as e:
+            return LookupResult(word=word, error=e)
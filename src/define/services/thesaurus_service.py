@@ -1,40 +1,125 @@
-from typing import List, Dict, Optional, Tuple
+import sys
+from collections import OrderedDict
+from threading import Lock
+from typing import List, Dict, Optional, Tuple, Iterator
 
-from define.utils import ServiceBase, APIClient, TextProcessor
+from define.utils import ServiceBase, APIClient, RefStore, TextProcessor, Vocabulary, Timings, PRIORITY_USER, PRIORITY_BACKGROUND
 from define.models import Entry, Definition, Pronunciation
 
+# (synonyms, related, antonyms) já extraídos de um sense
+SenseLists = Tuple[List[str], List[str], List[str]]
+
+# (senses por part of speech, senses da primeira entrada)
+SenseIndex = Tuple[Dict[str, List[SenseLists]], List[SenseLists]]
+
 
 class ThesaurusService(ServiceBase):
     """Service para processar thesaurus Merriam-Webster"""
 
+    # Quantas respostas indexadas ficam em memória (batch/REPL/daemon)
+    SENSE_INDEX_SIZE = 256
+
     def __init__(self, parent):
         super().__init__(parent)
         self.api_client = APIClient()
-        self.text_processor = TextProcessor(self.api_client)
+        self.text_processor = TextProcessor(self.api_client, ref_store=RefStore(), namespace="thes")
+        self.vocabulary = Vocabulary()
+        self.timings = Timings()
+
+        # word -> (raw_data, índice por part of speech), LRU
+        self._sense_indexes: "OrderedDict[str, Tuple[List[Dict], SenseIndex]]" = OrderedDict()
+        self._sense_indexes_lock = Lock()
 
         # Injeta resolver de refs (mesmo padrão do DictionaryService)
         self.text_processor.set_ref_resolver(self._resolve_ref)
 
     # ========== PUBLIC METHODS ==========
 
-    def fetch_and_process(self, word: str) -> Optional[Tuple[List[Entry], List[Entry]]]:
+    def fetch_and_process(self, word: str,
+                          priority: int = PRIORITY_USER) -> Optional[Tuple[List[Entry], List[Entry]]]:
         """
         Busca e processa palavra APENAS no thesaurus (modo standalone -t).
 
         Args:
             word: Palavra a buscar
+            priority: Prioridade no QuotaScheduler (PRIORITY_USER ou PRIORITY_BACKGROUND)
 
         Returns:
             Tuple com (main_entries, sub_entries) ou None se não encontrar
         """
-        raw_data = self._fetch_thesaurus_data(word)
+        raw_data = self._fetch_thesaurus_data(word, priority)
 
         if not raw_data or not any(isinstance(e, dict) for e in raw_data):
             return None
 
-        return self._process_thesaurus_entries(raw_data, word)
+        with self.timings.stage("thesaurus parsing"):
+            return self._process_thesaurus_entries(raw_data, word)
+
+    def fetch_raw(self, word: str, priority: int = PRIORITY_USER) -> Optional[List[Dict]]:
+        """
+        Busca os dados brutos do thesaurus sem processá-los.
+
+        Permite disparar o GET em paralelo com o dicionário e repassar o
+        resultado para enrich_entries() depois.
+
+        Args:
+            word: Palavra a buscar
+            priority: Prioridade no QuotaScheduler (PRIORITY_USER ou PRIORITY_BACKGROUND)
+
+        Returns:
+            Lista de dicts com dados do thesaurus, ou None se falhar
+        """
+        return self._fetch_thesaurus_data(word, priority)
+
+    def get_suggestions(self, word: str) -> List[str]:
+        """
+        Sugestões da API para uma palavra que não foi encontrada (sem novo GET).
+
+        Args:
+            word: Palavra buscada
+
+        Returns:
+            Lista de palavras sugeridas pelo thesaurus (vazia se não houver)
+        """
+        return self.api_client.get_suggestions(f"thes_{word}")
+
+    def has_recent_failure(self, word: str) -> bool:
+        """
+        Indica se o último fetch da palavra falhou por erro transitório.
+
+        Args:
+            word: Palavra buscada
+
+        Returns:
+            True se a ausência de dados do thesaurus pode ser temporária
+        """
+        return self.api_client.has_recent_failure(f"thes_{word}")
+
+    def iter_entries(self, raw_data: List[Dict], query_word: str) -> Iterator[Entry]:
+        """
+        Processa e entrega uma Entry por vez (modo standalone -t, streaming).
+
+        Args:
+            raw_data: Dados brutos do API
+            query_word: Palavra buscada
+
+        Yields:
+            Entradas principais primeiro, depois sub-entradas
+        """
+        # Resolve todas as cross-refs de uma vez, em paralelo, antes dos senses
+        self.text_processor.prefetch_refs(self._iter_texts(raw_data))
+
+        raw_entries = [entry for entry in raw_data if isinstance(entry, dict)]
+        ordered = [entry for entry in raw_entries if self._is_main_entry(entry, query_word)]
+        ordered += [entry for entry in raw_entries if not self._is_main_entry(entry, query_word)]
+
+        for thes_entry in ordered:
+            yield self._create_entry_from_thesaurus(thes_entry, query_word)
+
+        # Alimenta as sugestões de grafia
+        self.vocabulary.add_raw_entries(raw_entries)
 
-    def enrich_entries(self, word: str, entries: List[Entry]) -> None:
+    def enrich_entries(self, word: str, entries: List[Entry], raw_data: Optional[List[Dict]] = None) -> None:
         """
         Enriquece entradas IN-PLACE com dados do thesaurus (modo default).
 
@@ -44,22 +129,26 @@ class ThesaurusService(ServiceBase):
         Args:
             word: Palavra a buscar no thesaurus
             entries: Lista de Entry objects a serem enriquecidos (modificados in-place)
+            raw_data: Dados já buscados via fetch_raw() (evita novo GET)
 
         Returns:
             None - modifica entries diretamente
         """
-        raw_data = self._fetch_thesaurus_data(word)
+        if raw_data is None:
+            raw_data = self._fetch_thesaurus_data(word)
 
         if not raw_data:
             return  # Early return se não achar dados
 
         # Enriquece cada entrada IN-PLACE
-        for entry in entries:
-            self._enrich_entry(entry, raw_data)
+        with self.timings.stage("thesaurus enrichment"):
+            by_pos, fallback = self._get_sense_index(word, raw_data)
+            for entry in entries:
+                self._enrich_entry(entry, by_pos, fallback)
 
     # ========== PRIVATE FETCH HELPER ==========
 
-    def _resolve_ref(self, ref_word: str) -> str:
+    def _resolve_ref(self, ref_word: str) -> Optional[str]:
         """
         Resolve cross-reference buscando na API (para TextProcessor).
 
@@ -67,16 +156,17 @@ class ThesaurusService(ServiceBase):
             ref_word: Palavra referenciada
 
         Returns:
-            Headword resolvido ou palavra original
+            Headword resolvido, ou None se não conseguir (não é persistido)
         """
-        raw_data = self._fetch_thesaurus_data(ref_word)
+        # Cross-refs são trabalho de fundo: cedem a vez (e a cota) aos lookups do usuário
+        raw_data = self._fetch_thesaurus_data(ref_word, priority=PRIORITY_BACKGROUND)
 
         if raw_data and isinstance(raw_data, list) and raw_data and isinstance(raw_data[0], dict):
             return raw_data[0].get('hwi', {}).get('hw', ref_word).replace('*', '')
 
-        return ref_word
+        return None
 
-    def _fetch_thesaurus_data(self, word: str) -> Optional[List[Dict]]:
+    def _fetch_thesaurus_data(self, word: str, priority: int = PRIORITY_USER) -> Optional[List[Dict]]:
         """
         Busca dados brutos do thesaurus API.
 
@@ -84,6 +174,7 @@ class ThesaurusService(ServiceBase):
 
         Args:
             word: Palavra a buscar
+            priority: Prioridade no QuotaScheduler (PRIORITY_USER ou PRIORITY_BACKGROUND)
 
         Returns:
             Lista de dicts com dados do thesaurus, ou None se falhar
@@ -100,7 +191,7 @@ class ThesaurusService(ServiceBase):
         url = f"{thes_url[list(thes_url.keys())[0]]}{word}?key={thes_key[list(thes_key.keys())[0]]}"
 
         # Busca dados via APIClient
-        return self.api_client.fetch(url, f"thes_{word}")
+        return self.api_client.fetch(url, f"thes_{word}", priority=priority)
 
     # ========== PROCESSING METHODS ==========
 
@@ -118,12 +209,7 @@ class ThesaurusService(ServiceBase):
         main_entries = []
         sub_entries = []
 
-        for thes_entry in raw_data:
-            if not isinstance(thes_entry, dict):
-                continue
-
-            processed = self._create_entry_from_thesaurus(thes_entry, query_word)
-
+        for processed in self.iter_entries(raw_data, query_word):
             if processed.is_main_entry:
                 main_entries.append(processed)
             else:
@@ -131,6 +217,30 @@ class ThesaurusService(ServiceBase):
 
         return main_entries, sub_entries
 
+    def _iter_texts(self, raw_data: List[Dict]) -> Iterator[str]:
+        """
+        Percorre os textos de definição que passam por clean_text.
+
+        Args:
+            raw_data: Dados brutos do API
+
+        Yields:
+            Strings com markup MW
+        """
+        for thes_entry in raw_data:
+            if not isinstance(thes_entry, dict):
+                continue
+
+            for def_block in thes_entry.get('def', []):
+                for sseq_block in def_block.get('sseq', []):
+                    for sense_tuple in sseq_block:
+                        if sense_tuple[0] != 'sense':
+                            continue
+
+                        for dt_item in sense_tuple[1].get('dt', []):
+                            if dt_item[0] == 'text':
+                                yield dt_item[1]
+
     def _create_entry_from_thesaurus(self, thes_entry: Dict, query_word: str) -> Entry:
         """
         Cria Entry object a partir de dados do thesaurus.
@@ -143,8 +253,7 @@ class ThesaurusService(ServiceBase):
             Entry object completo
         """
         headword = thes_entry.get('hwi', {}).get('hw', '').replace('*', '')
-        hwi_hw = headword.lower()
-        is_main = hwi_hw == query_word.lower()
+        is_main = self._is_main_entry(thes_entry, query_word)
 
         # Extrai definições do thesaurus
         definitions = self._extract_thesaurus_definitions(thes_entry)
@@ -166,6 +275,19 @@ class ThesaurusService(ServiceBase):
             is_main_entry=is_main
         )
 
+    def _is_main_entry(self, thes_entry: Dict, query_word: str) -> bool:
+        """
+        Entrada principal = headword igual à palavra buscada.
+
+        Args:
+            thes_entry: Dict com dados de uma entrada do thesaurus
+            query_word: Palavra buscada
+
+        Returns:
+            True se for entrada principal
+        """
+        return thes_entry.get('hwi', {}).get('hw', '').replace('*', '').lower() == query_word.lower()
+
     def _extract_pronunciations(self, entry: Dict) -> List[Pronunciation]:
         """
         Extrai pronúncias de uma entrada.
@@ -246,81 +368,118 @@ class ThesaurusService(ServiceBase):
 
     # ========== ENRICHMENT METHODS ==========
 
-    def _enrich_entry(self, entry: Entry, raw_thesaurus: List[Dict]) -> None:
+    def _enrich_entry(self, entry: Entry, by_pos: Dict[str, List[SenseLists]],
+                      fallback: List[SenseLists]) -> None:
         """
         Enriquece uma entrada IN-PLACE com dados do thesaurus.
 
         Args:
             entry: Entry object a ser modificado
-            raw_thesaurus: Dados brutos do thesaurus API
+            by_pos: Senses indexados por part of speech (ver _build_sense_index)
+            fallback: Senses da primeira entrada do thesaurus
         """
-        # Filtra por part of speech
-        thes_entry = self._filter_by_pos(raw_thesaurus, entry.part_of_speech)
+        # Filtra por part of speech (fallback: primeira entrada)
+        senses = by_pos.get(entry.part_of_speech.lower(), fallback)
 
-        if not thes_entry:
-            return
+        # Enriquece cada definição IN-PLACE (sense i -> definição i)
+        for definition, sense_lists in zip(entry.definitions, senses):
+            self._merge_into_definition(definition, sense_lists)
 
-        # Enriquece cada definição IN-PLACE
-        for i, definition in enumerate(entry.definitions):
-            thes_sense = self._get_sense_by_index(thes_entry, i)
-            if thes_sense:
-                self._merge_into_definition(definition, thes_sense)
+    def _get_sense_index(self, word: str, raw_data: List[Dict]) -> SenseIndex:
+        """
+        Devolve o índice da resposta, montando-o só na primeira vez.
+
+        O APIClient devolve o mesmo objeto para a mesma palavra, então o
+        índice é reaproveitado entre entradas, lookups e itens de um batch.
+
+        Args:
+            word: Palavra buscada
+            raw_data: Dados brutos do thesaurus API
 
-    def _filter_by_pos(self, thesaurus_data: List[Dict], pos: str) -> Optional[Dict]:
+        Returns:
+            Tuple com (senses por part of speech, senses de fallback)
         """
-        Filtra entry do thesaurus por part of speech.
+        with self._sense_indexes_lock:
+            cached = self._sense_indexes.get(word)
+            if cached is not None and cached[0] is raw_data:
+                self._sense_indexes.move_to_end(word)
+                return cached[1]
+
+        index = self._build_sense_index(raw_data)
+
+        with self._sense_indexes_lock:
+            self._sense_indexes[word] = (raw_data, index)
+            self._sense_indexes.move_to_end(word)
+            while len(self._sense_indexes) > self.SENSE_INDEX_SIZE:
+                self._sense_indexes.popitem(last=False)
+
+        return index
+
+    def _build_sense_index(self, raw_data: List[Dict]) -> SenseIndex:
+        """
+        Percorre a resposta uma única vez e achata os senses por part of speech.
+
+        Só a primeira entrada de cada part of speech é indexada (mesma regra
+        do antigo filtro linear), com syn/rel/ant já extraídos.
 
         Args:
-            thesaurus_data: Lista de entries do thesaurus
-            pos: Part of speech a buscar
+            raw_data: Dados brutos do thesaurus API
 
         Returns:
-            Entry correspondente ou None
+            Tuple com (dict pos minúsculo -> senses, senses da primeira entrada)
         """
-        for entry in thesaurus_data:
-            entry_pos = entry.get('fl', '').lower()
-            if entry_pos == pos.lower():
-                return entry
+        by_pos: Dict[str, List[SenseLists]] = {}
+        fallback: Optional[List[SenseLists]] = None
 
-        # Fallback: retorna primeiro entry
-        return thesaurus_data[0] if thesaurus_data else None
+        for thes_entry in raw_data:
+            if not isinstance(thes_entry, dict):
+                continue
+
+            pos = thes_entry.get('fl', '').lower()
+            if pos in by_pos:
+                continue
 
-    def _get_sense_by_index(self, thes_entry: Dict, sense_index: int) -> Optional[Dict]:
+            senses = self._flatten_senses(thes_entry)
+            by_pos[pos] = senses
+            if fallback is None:
+                fallback = senses
+
+        return by_pos, fallback or []
+
+    def _flatten_senses(self, thes_entry: Dict) -> List[SenseLists]:
         """
-        Pega sense do thesaurus pelo índice.
+        Extrai syn/rel/ant de todos os senses de uma entrada, em ordem.
 
         Args:
             thes_entry: Entry do thesaurus
-            sense_index: Índice do sense desejado
 
         Returns:
-            Dict com dados do sense ou None
+            Lista de (synonyms, related, antonyms), um item por sense
         """
-        defs = thes_entry.get('def', [])
-        current_index = 0
+        senses = []
 
-        for def_block in defs:
+        for def_block in thes_entry.get('def', []):
             for sseq_block in def_block.get('sseq', []):
                 for sense_tuple in sseq_block:
                     if sense_tuple[0] == 'sense':
-                        if current_index == sense_index:
-                            return sense_tuple[1]
-                        current_index += 1
+                        sense = sense_tuple[1]
+                        senses.append((
+                            self._extract_word_list(sense, 'syn_list'),
+                            self._extract_word_list(sense, 'rel_list'),
+                            self._extract_word_list(sense, 'ant_list'),
+                        ))
 
-        return None
+        return senses
 
-    def _merge_into_definition(self, definition: Definition, thes_sense: Dict) -> None:
+    def _merge_into_definition(self, definition: Definition, sense_lists: SenseLists) -> None:
         """
         Combina dados do thesaurus com definição existente IN-PLACE.
 
         Args:
             definition: Definition object a ser modificado
-            thes_sense: Sense do thesaurus com syn/ant/rel
+            sense_lists: (synonyms, related, antonyms) do sense correspondente
         """
-        # Extrai do thesaurus
-        thes_syns = self._extract_word_list(thes_sense, 'syn_list')
-        thes_rels = self._extract_word_list(thes_sense, 'rel_list')
-        thes_ants = self._extract_word_list(thes_sense, 'ant_list')
+        thes_syns, thes_rels, thes_ants = sense_lists
 
         # Merge e deduplica IN-PLACE
         definition.synonyms = list(set(definition.synonyms + thes_syns))
@@ -346,7 +505,8 @@ class ThesaurusService(ServiceBase):
         for group in groups:
             for wdobj in group:
                 if isinstance(wdobj, dict) and "wd" in wdobj:
-                    words.append(wdobj["wd"])
+                    # As mesmas palavras se repetem em milhares de definições
+                    words.append(sys.intern(wdobj["wd"]))
 
         return words
 
@@ -1,11 +1,29 @@
+import sqlite3
+import sys
+from contextlib import nullcontext
+
 from rich.console import Console
+from rich.text import Text
 from define.ui import Formatter
+from define.services import MODE_DICTIONARY, MODE_THESAURUS, MODE_BOTH, PREFETCH_HIT, PREFETCH_MISS, \
+    PREFETCH_NOT_FOUND, PREFETCH_FAILED
+from define.utils import APIClient, QuotaScheduler, PrefixIndex, PrefetchProgress, read_word_list, SearchIndex, \
+    Timings
+from define.utils.search_index import MATCH_START, MATCH_END
+
+
+class _SilentStatus:
+    """Status que não mostra nada (console não interativo)"""
+
+    def update(self, *args, **kwargs):
+        pass
 
 
 class UI:
-    def __init__(self, parent):
+    def __init__(self, parent, console=None, use_pager=True):
         self.__parent = parent
-        self.console = Console()
+        self.console = console if console is not None else Console()
+        self.use_pager = use_pager
         self.formatter = Formatter(self.console.size.width - 4)
 
     def check_configure_mode(self):
@@ -61,79 +79,417 @@ class UI:
     def display_results(self, main_entries, sub_entries):
         """Exibe resultados formatados"""
         try:
-            with self.console.pager(styles=True):
-                # Entradas principais
-                for entry in main_entries:
-                    self.console.print(self.formatter.format_main_entry(entry))
-
-                # Sub-entradas
-                if sub_entries:
-                    for entry in sub_entries:
-                        self.console.print(self.formatter.format_sub_entry(entry))
+            if not self.use_pager:
+                self.print_entries(main_entries, sub_entries)
+                return
 
-                self.console.print('-' * self.formatter.width)
+            # O pager só abre ao sair do bloco: o __exit__ é o tempo de pager
+            with Timings().stage("pager"):
+                with self.console.pager(styles=True):
+                    self.print_entries(main_entries, sub_entries)
 
         except Exception as e:
             self.console.print(f"[bold red]Error displaying results: {e}[/bold red]")
 
-    def run(self):
+    def print_entries(self, main_entries, sub_entries):
+        """Imprime entradas principais, sub-entradas e o separador"""
+        with Timings().stage("rendering"):
+            self._print_entries(main_entries, sub_entries)
+
+    def _print_entries(self, main_entries, sub_entries):
+        # Entradas principais
+        for entry in main_entries:
+            self.console.print(self.formatter.format_main_entry(entry))
+
+        # Sub-entradas
+        if sub_entries:
+            for entry in sub_entries:
+                self.console.print(self.formatter.format_sub_entry(entry))
+
+        self.console.print('-' * self.formatter.width)
+
+    def status(self, message):
+        """console.status só em console interativo: no buffer do daemon o spinner viraria saída"""
+        if self.console.is_interactive:
+            return self.console.status(message)
+        return nullcontext(_SilentStatus())
+
+    def should_page(self):
+        """Pager só em terminal; fora de TTY (ou com --no-pager) a saída é direta"""
+        args = self.__parent.args
+        return self.use_pager and self.console.is_terminal and not getattr(args, "no_pager", False)
+
+    def stream_results(self, word, mode):
+        """Renderiza cada Entry assim que fica pronta, sem bufferizar no pager"""
+        found = False
+        with self.status("[bold green]Fetching definitions...[/bold green]"):
+            for entry in self.__parent.lookup.iter_lookup(word, mode):
+                found = True
+                with Timings().stage("rendering"):
+                    if entry.is_main_entry:
+                        self.console.print(self.formatter.format_main_entry(entry))
+                    else:
+                        self.console.print(self.formatter.format_sub_entry(entry))
+
+        if found:
+            self.console.print('-' * self.formatter.width)
+        return found
+
+    def not_found_message(self, word, mode):
+        message = self._not_found_reason(word, mode)
+
+        suggestions = self.__parent.lookup.suggest(word, mode)
+        if suggestions:
+            message += f"\n[yellow]Did you mean:[/yellow] {', '.join(suggestions)}?"
+        return message
+
+    def _not_found_reason(self, word, mode):
+        if QuotaScheduler().is_exhausted():
+            return f"[bold red]Daily request limit reached, could not look up '{word}'. " \
+                   f"Raise 'Daily Request Limit' in config.toml or try again tomorrow.[/bold red]"
+        if not APIClient().is_available():
+            return f"[bold red]Merriam-Webster API is unreachable, could not look up '{word}'. " \
+                   f"Try again later.[/bold red]"
+        if self.__parent.lookup.has_recent_failure(word, mode):
+            return f"[bold red]Could not look up '{word}' because of a temporary API error. " \
+                   f"Try again in a moment.[/bold red]"
+        if mode == MODE_DICTIONARY:
+            return f"[bold red]No dictionary results found for '{word}'[/bold red]"
+        if mode == MODE_THESAURUS:
+            return f"[bold red]No thesaurus results found for '{word}'[/bold red]"
+        return f"[bold red]No results found for '{word}'[/bold red]"
+
+    def run_batch(self):
+        """Define todas as palavras de um arquivo/stdin, na ordem de entrada"""
+        mode = self.__parent.get_mode()
+        on_error = self.__parent.args.on_error
+
+        try:
+            words = read_word_list(self.__parent.args.batch)
+            results = self.__parent.lookup.lookup_many(words, mode, self.__parent.get_workers())
+
+            with self.status("[bold green]Fetching definitions...[/bold green]"):
+                for result in results:
+                    if not result.failed:
+                        self.print_entries(*result.entries)
+                        continue
+
+                    if on_error != "skip":
+                        if result.error is not None:
+                            self.console.print(
+                                f"[bold red]Error looking up '{result.word}': {result.error}[/bold red]")
+                        else:
+                            self.console.print(self.not_found_message(result.word, mode))
+
+                    if on_error == "abort":
+                        exit(1)
+        except OSError as e:
+            self.console.print(f"[bold red]Error reading word list: {e}[/bold red]")
+            exit(1)
+
+    def run_export(self):
+        """Exporta os resultados (palavra ou --batch) para JSONL/CSV/SQLite, palavra a palavra"""
+        from define.export import open_writer
+
+        args = self.__parent.args
+        mode = self.__parent.get_mode()
+        # Exportando para o stdout, mensagens vão para o stderr
+        messages = Console(stderr=True) if args.output == "-" else self.console
+
+        try:
+            writer = open_writer(args.export, args.output)
+        except (OSError, ValueError, sqlite3.Error) as e:
+            messages.print(f"[bold red]Cannot open export output: {e}[/bold red]")
+            exit(1)
+
+        # Pipeline de geradores: palavras -> lookups (pool limitado) -> writer
+        words = [args.Word] if args.Word else read_word_list(args.batch)
+        exported = 0
+        try:
+            for result in self.__parent.lookup.lookup_many(words, mode, self.__parent.get_workers()):
+                if not result.failed:
+                    writer.write(result.word, result.entries)
+                    exported += 1
+                    continue
+
+                if args.on_error != "skip":
+                    if result.error is not None:
+                        messages.print(f"[bold red]Error looking up '{result.word}': {result.error}[/bold red]")
+                    else:
+                        messages.print(self.not_found_message(result.word, mode))
+
+                if args.on_error == "abort":
+                    exit(1)
+        except OSError as e:
+            messages.print(f"[bold red]Error exporting: {e}[/bold red]")
+            exit(1)
+        finally:
+            writer.close()
+
+        if args.output != "-":
+            messages.print(f"Exported {exported} words to {args.output}")
+
+    def run_prefetch(self):
+        """Aquece os caches com uma lista de palavras, sem imprimir as definições (retomável)"""
+        source = self.__parent.args.prefetch
+        mode = self.__parent.get_mode()
+
+        if not self.__parent.config.get_value("Cache Enabled", True):
+            self.console.print("[bold red]--prefetch needs the cache ('Cache Enabled' in config.toml)[/bold red]")
+            exit(1)
+
+        progress = PrefetchProgress.for_word_list(source)
+        counts = {PREFETCH_HIT: 0, PREFETCH_MISS: 0, PREFETCH_NOT_FOUND: 0, PREFETCH_FAILED: 0}
+        skipped = 0
+
+        def pending_words():
+            nonlocal skipped
+            for word in read_word_list(source):
+                if progress is not None and progress.is_done(word):
+                    skipped += 1
+                    continue
+                yield word
+
+        try:
+            results = self.__parent.lookup.prefetch_many(pending_words(), mode, self.__parent.get_workers())
+            with self.status("[bold green]Prefetching...[/bold green]") as status:
+                for word, result in results:
+                    counts[result] += 1
+                    # Falhas ficam de fora do progresso: a próxima execução tenta de novo
+                    if progress is not None and result != PREFETCH_FAILED:
+                        progress.mark(word)
+                    status.update(f"[bold green]Prefetching...[/bold green] {sum(counts.values())} words, "
+                                  f"{counts[PREFETCH_FAILED]} failures")
+        except OSError as e:
+            self.console.print(f"[bold red]Error reading word list: {e}[/bold red]")
+            exit(1)
+        finally:
+            if progress is not None:
+                progress.close()
+
+        failures = counts[PREFETCH_NOT_FOUND] + counts[PREFETCH_FAILED]
         self.console.print(
+            f"Prefetched {sum(counts.values())} words: {counts[PREFETCH_HIT]} hits (already cached), "
+            f"{counts[PREFETCH_MISS]} misses (fetched now), {failures} failures "
+            f"({counts[PREFETCH_NOT_FOUND]} not found, {counts[PREFETCH_FAILED]} errors)"
+        )
+        if skipped:
+            self.console.print(f"{skipped} words were already done in a previous run")
+
+        if counts[PREFETCH_FAILED]:
+            self.console.print("[yellow]Run the same command again to retry the errors.[/yellow]")
+        elif progress is not None:
+            progress.discard()
+
+    def run_search(self):
+        """Dicionário reverso: busca no índice local, sem chamadas à API"""
+        phrase = self.__parent.args.search
+        results = SearchIndex().search(phrase)
+
+        if results is None:
+            self.console.print("[bold red]Search index unavailable (SQLite without FTS5 support)[/bold red]")
+            return
+
+        if not results:
+            self.console.print(f"[bold red]No cached definitions mention '{phrase}'[/bold red]")
+            return
+
+        for headword, part_of_speech, snippet in results:
+            line = Text()
+            line.append(headword, style='bold green')
+            if part_of_speech:
+                line.append(f" [{part_of_speech}]")
+            line.append('\n      ')
+            self._append_snippet(line, snippet)
+            self.console.print(line)
+
+    def _append_snippet(self, text, snippet):
+        """Adiciona o snippet destacando os trechos que casaram"""
+        for i, chunk in enumerate(snippet.split(MATCH_START)):
+            if i == 0:
+                text.append(chunk)
+                continue
+            matched, _, rest = chunk.partition(MATCH_END)
+            text.append(matched, style='bold yellow')
+            text.append(rest)
+
+    REPL_HELP = (
+        "Type a word to define it, or a command:\n"
+        "  :d     dictionary only\n"
+        "  :t     thesaurus only\n"
+        "  :b     dictionary + thesaurus (default)\n"
+        "  :help  show this help\n"
+        "  :q     quit"
+    )
+
+    REPL_MODES = {":d": MODE_DICTIONARY, ":t": MODE_THESAURUS, ":b": MODE_BOTH}
+
+    REPL_COMMANDS = (":b", ":d", ":help", ":q", ":quit", ":t")
+
+    def enable_completion(self, commands=()):
+        """Tab completion das palavras já vistas (e dos comandos do REPL), se houver readline"""
+        if not sys.stdin.isatty():
+            return False
+
+        try:
+            import readline
+        except ImportError:
+            return False
+
+        prefix_index = PrefixIndex()
+        matches = []
+
+        def complete(text, state):
+            if state == 0:
+                if text.startswith(":"):
+                    matches[:] = [command for command in commands if command.startswith(text)]
+                else:
+                    matches[:] = prefix_index.complete(text)
+            return matches[state] if state < len(matches) else None
+
+        readline.set_completer(complete)
+        # A linha inteira é a palavra (headwords podem ter espaço: "run up")
+        readline.set_completer_delims("")
+        if "libedit" in (readline.__doc__ or ""):
+            readline.parse_and_bind("bind ^I rl_complete")
+        else:
+            readline.parse_and_bind("tab: complete")
+        return True
+
+    def run_interactive(self):
+        """Sessão interativa: services, caches e refs resolvidas ficam quentes entre buscas"""
+        mode = self.__parent.get_mode()
+        self.console.print(self.REPL_HELP + "\n")
+        self.enable_completion(self.REPL_COMMANDS)
+
+        word = self.__parent.args.Word
+        while True:
+            if word is None:
+                try:
+                    word = self.console.input(f"[bold]define[/bold] ({mode})> ").strip()
+                except (EOFError, KeyboardInterrupt):
+                    self.console.print()
+                    return
+
+            command, word = word, None
+            if not command:
+                continue
+
+            if command in (":q", ":quit", ":exit"):
+                return
+            if command in (":h", ":help"):
+                self.console.print(self.REPL_HELP)
+                continue
+            if command in self.REPL_MODES:
+                mode = self.REPL_MODES[command]
+                self.console.print(f"[italic]Mode: {mode}[/italic]")
+                continue
+            if command.startswith(":"):
+                self.console.print(f"[bold red]Unknown command '{command}'[/bold red] (:help lists commands)")
+                continue
+
+            self.lookup_and_print(command, mode)
+
+    def lookup_and_print(self, word, mode):
+        """Busca e imprime direto no console (sem pager)"""
+        try:
+            found = self.stream_results(word, mode)
+        except Exception as e:
+            self.console.print(f"[bold red]Error looking up '{word}': {e}[/bold red]")
+            return
+
+        if not found:
+            self.console.print(self.not_found_message(word, mode))
+
+    def print_timings(self):
+        """Imprime no stderr o breakdown de latência por estágio (--timings)"""
+        from rich.table import Table
+
+        timings = Timings()
+        table = Table(title="Timings", title_justify="left", show_edge=False)
+        table.add_column("Stage")
+        table.add_column("Wall time", justify="right")
+        table.add_column("Calls", justify="right")
+
+        for name, seconds, calls in timings.stages():
+            table.add_row(name, f"{seconds * 1000:.1f} ms", str(calls))
+
+        counters = timings.counters()
+        always = ("http requests", "cache hits (memory)", "cache hits (disk)", "cache misses")
+        for name in always:
+            table.add_row(name, "", str(counters.get(name, 0)))
+        # Contadores opcionais (retries, circuito aberto...) só quando aconteceram
+        for name, value in counters.items():
+            if name not in always:
+                table.add_row(name, "", str(value))
+
+        console = Console(stderr=True)
+        console.print(table)
+        console.print("[dim]Stages overlap: parsing includes cross-ref resolution, which includes its http time; "
+                      "'pager' includes time spent reading.[/dim]")
+
+    def run(self):
+        # Exportando para o stdout, o banner vai para o stderr para não misturar com os dados
+        args = self.__parent.args
+        banner = Console(stderr=True) if getattr(args, "export", None) and args.output == "-" else self.console
+
+        banner.print(
             "[bold]Define[/bold] [italic white]V.0.0.1[/italic white] by Gustavo Henrique S. S. de Miranda\n")
-        self.console.print(
+        banner.print(
             "Definitions and thesaurus data provided by Merriam-Webster, Inc. © Merriam-Webster, Inc. All rights reserved.")
-        self.console.print(
+        banner.print(
             "This application uses data from Merriam-Webster's Dictionary and Thesaurus APIs, referenced with permission.")
-        self.console.print("\n")
+        banner.print("\n")
 
         if self.check_configure_mode():
             self.configure()
 
+        if self.__parent.args.search:
+            self.run_search()
+            return
+
         if self.__parent.run_mode:
             self.check_configuration()
 
+        if self.__parent.args.export:
+            self.run_export()
+            return
+
+        if self.__parent.args.batch:
+            self.run_batch()
+            return
+
+        if self.__parent.args.prefetch:
+            self.run_prefetch()
+            return
+
+        if self.__parent.args.interactive:
+            self.run_interactive()
+            return
+
         # Pega palavra
         if not self.check_if_word_argument_exists():
+            self.enable_completion()
             word = self.console.input("Please type the word to Define: ")
         else:
             word = self.__parent.args.Word
 
-        with self.console.status("[bold green]Fetching definitions...[/bold green]"):
-            main_entries = []
-            sub_entries = []
-
-            # 🎯 FLUXO 1: Apenas Dicionário (-d)
-            if self.__parent.args.dictionary and not self.__parent.args.thesaurus:
-                dict_result = self.__parent.dictionary.fetch_and_process(word)
-
-                if not dict_result:
-                    self.console.print(f"[bold red]No dictionary results found for '{word}'[/bold red]")
-                    return
-
-                main_entries, sub_entries = dict_result
-                # NÃO enriquece com thesaurus
-
-            # 🎯 FLUXO 2: Apenas Thesaurus (-t)
-            elif self.__parent.args.thesaurus and not self.__parent.args.dictionary:
-                thes_result = self.__parent.thesaurus.fetch_and_process(word)
+        mode = self.__parent.get_mode()
 
-                if not thes_result:
-                    self.console.print(f"[bold red]No thesaurus results found for '{word}'[/bold red]")
-                    return
-
-                main_entries, sub_entries = thes_result
-                # Já vem processado do thesaurus
+        # Sem pager: mostra cada entrada assim que fica pronta
+        if not self.should_page():
+            if not self.stream_results(word, mode):
+                self.console.print(self.not_found_message(word, mode))
+            return
 
-            # 🎯 FLUXO 3: Ambos (default, sem flags)
-            else:
-                dict_result = self.__parent.dictionary.fetch_and_process(word)
+        with self.status("[bold green]Fetching definitions...[/bold green]"):
+            result = self.__parent.lookup.lookup(word, mode)
 
-                if not dict_result:
-                    self.console.print(f"[bold red]No results found for '{word}'[/bold red]")
-                    return
+        if not result:
+            self.console.print(self.not_found_message(word, mode))
+            return
 
-                main_entries, sub_entries = dict_result
-            if not (self.__parent.args.dictionary and not self.__parent.args.thesaurus):
-                self.__parent.thesaurus.enrich_entries(word, main_entries)
+        main_entries, sub_entries = result
 
         # Exibe resultados
         self.display_results(main_entries, sub_entries)
\ No newline at end of file
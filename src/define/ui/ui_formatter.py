@@ -1,18 +1,88 @@
 import textwrap
+from collections import OrderedDict
+from threading import Lock
+from typing import Callable, List, Tuple
+
 from rich.text import Text
 
 
 from define.models import Entry, Definition
+from define.utils import Timings
+
+# Rótulo e estilo das listas de palavras de uma definição, na ordem de exibição
+WORD_LISTS = (
+    ("synonyms", "Synonyms: ", "bold cyan"),
+    ("related", "Related: ", "bold blue"),
+    ("antonyms", "Antonyms: ", "bold red"),
+)
 
 
 class Formatter:
-    """Formata entradas para exibição"""
+    """Formata entradas para exibição
+
+    As renderizações ficam num LRU compartilhado entre instâncias (o daemon e
+    o REPL criam/reusam Formatters para as mesmas palavras), indexado pelo
+    conteúdo da entrada e pela largura. O Text devolvido é o próprio objeto do
+    cache, sem cópia (Text.copy() custa um terço da renderização): serve para
+    imprimir, não para ser alterado.
+    """
+
+    RENDER_CACHE_SIZE = 512
+
+    _render_cache: "OrderedDict[Tuple, Text]" = OrderedDict()
+    _render_lock = Lock()
 
     def __init__(self, console_width: int):
         self.width = console_width
 
     def format_main_entry(self, entry: Entry) -> Text:
         """Formata entrada principal"""
+        return self._render("main", entry, self._render_main_entry)
+
+    def format_sub_entry(self, entry: Entry) -> Text:
+        """Formata sub-entrada (compostos)"""
+        return self._render("sub", entry, self._render_sub_entry)
+
+    def _render(self, kind: str, entry: Entry, render: Callable[[Entry], Text]) -> Text:
+        """Busca a renderização no cache ou renderiza e guarda (descartando a menos usada)"""
+        key = (kind, self.width, self._entry_key(entry))
+
+        with self._render_lock:
+            cached = self._render_cache.get(key)
+            if cached is not None:
+                self._render_cache.move_to_end(key)
+
+        if cached is not None:
+            Timings().count("render cache hits")
+            return cached
+
+        text = render(entry)
+
+        with self._render_lock:
+            self._render_cache[key] = text
+            self._render_cache.move_to_end(key)
+            while len(self._render_cache) > self.RENDER_CACHE_SIZE:
+                self._render_cache.popitem(last=False)
+
+        return text
+
+    @staticmethod
+    def _entry_key(entry: Entry) -> Tuple:
+        """Conteúdo da entrada como tupla hashable (entradas vindas do cache são objetos novos)"""
+        return (
+            entry.headword,
+            entry.homonym_num,
+            entry.part_of_speech,
+            tuple(p.text for p in entry.pronunciations),
+            entry.etymology,
+            tuple(
+                (d.index, d.text, tuple(d.examples), tuple(d.synonyms), tuple(d.related), tuple(d.antonyms))
+                for d in entry.definitions
+            ),
+            tuple(entry.short_summary),
+        )
+
+    def _render_main_entry(self, entry: Entry) -> Text:
         text = Text()
 
         # Header
@@ -40,8 +110,7 @@ class Formatter:
         text.append('\n')
         return text
 
-    def format_sub_entry(self, entry: Entry) -> Text:
-        """Formata sub-entrada (compostos)"""
+    def _render_sub_entry(self, entry: Entry) -> Text:
         text = Text()
 
         # Header simplificado
@@ -113,43 +182,39 @@ class Formatter:
                 )
                 text.append(wrapped_ex + '\n')
 
-        # Synonyms
-        if definition.synonyms:
-            text.append('    ', style='dim')
-            text.append('Synonyms: ', style='bold cyan')
-            syns = ', '.join(sorted(set(definition.synonyms)))
-            wrapped_syns = textwrap.fill(
-                syns,
-                width=self.width - 14,
-                initial_indent='',
-                subsequent_indent=''
-            )
-            text.append(wrapped_syns + '\n')
-
-        # Related
-        if definition.related:
-            text.append('    ', style='dim')
-            text.append('Related: ', style='bold blue')
-            rels = ', '.join(sorted(set(definition.related)))
-            wrapped_rels = textwrap.fill(
-                rels,
-                width=self.width - 14,
-                initial_indent='',
-                subsequent_indent=''
-            )
-            text.append(wrapped_rels + '\n')
-
-        # Antonyms
-        if definition.antonyms:
-            text.append('    ', style='dim')
-            text.append('Antonyms: ', style='bold red')
-            ants = ', '.join(sorted(set(definition.antonyms)))
-            wrapped_ants = textwrap.fill(
-                ants,
-                width=self.width - 14,
-                initial_indent='',
-                subsequent_indent=''
-            )
-            text.append(wrapped_ants + '\n')
+        # Synonyms, related e antonyms
+        for field_name, label, style in WORD_LISTS:
+            words = getattr(definition, field_name)
+            if words:
+                text.append('    ', style='dim')
+                text.append(label, style=style)
+                text.append(self._wrap_words(sorted(set(words)), self.width - 14) + '\n')
+
+        return text
 
-        return text
\ No newline at end of file
+    @staticmethod
+    def _wrap_words(words: List[str], width: int) -> str:
+        """
+        Quebra uma lista de palavras separadas por vírgula em linhas de até `width`.
+
+        Empacotamento guloso por espaços, sem as regex do textwrap (listas de
+        sinônimos chegam a centenas de palavras); palavras com hífen não são
+        partidas no fim da linha. Palavras maiores que a linha caem no textwrap.
+        """
+        tokens = ', '.join(words).split()
+        if not tokens or max(map(len, tokens)) > width:
+            return textwrap.fill(', '.join(words), width=width)
+
+        lines = []
+        line: List[str] = []
+        length = -1
+        for token in tokens:
+            if line and length + 1 + len(token) > width:
+                lines.append(' '.join(line))
+                line = []
+                length = -1
+            line.append(token)
+            length += 1 + len(token)
+        lines.append(' '.join(line))
+
+        return '\n'.join(lines)
\ No newline at end of file
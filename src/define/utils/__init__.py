@@ -1,7 +1,20 @@
 from define.utils.config_manager import ConfigManager
 from define.utils.directory_manager import DirectoryManager
 from define.utils.service_base import ServiceBase
+from define.utils.sqlite_connection import SQLiteConnection
+from define.utils.response_cache import ResponseCache
+from define.utils.entry_cache import EntryCache
+from define.utils.circuit_breaker import CircuitBreaker
+from define.utils.quota import QuotaScheduler, PRIORITY_USER, PRIORITY_BACKGROUND
 from define.utils.api_client import APIClient
+from define.utils.ref_store import RefStore
 from define.utils.text_processor import TextProcessor
+from define.utils.word_list import read_word_list
+from define.utils.prefetch_progress import PrefetchProgress
+from define.utils.search_index import SearchIndex
+from define.utils.vocabulary import Vocabulary
+from define.utils.spell_index import SpellIndex
+from define.utils.prefix_index import PrefixIndex
+from define.utils.timings import Timings
 
-__all__ = ["ConfigManager", "DirectoryManager","ServiceBase","APIClient","TextProcessor"]
\ No newline at end of file
+__all__ = ["ConfigManager", "DirectoryManager","ServiceBase","SQLiteConnection","ResponseCache","EntryCache","CircuitBreaker","QuotaScheduler","PRIORITY_USER","PRIORITY_BACKGROUND","APIClient","RefStore","TextProcessor","read_word_list","PrefetchProgress","SearchIndex","Vocabulary","SpellIndex","PrefixIndex","Timings"]
\ No newline at end of file
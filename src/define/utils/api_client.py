@@ -1,32 +1,234 @@
-from requests import request
+import random
+import time
+from collections import OrderedDict
+from threading import Lock
 from typing import Optional, Dict, Any, List
+from urllib.parse import parse_qs, urlsplit
+
+from define.utils.circuit_breaker import CircuitBreaker
+from define.utils.config_manager import ConfigManager
+from define.utils.quota import QuotaScheduler, PRIORITY_USER
+from define.utils.response_cache import ResponseCache
+from define.utils.singleton import SingletonMeta
+from define.utils.timings import Timings
+
+# Prefixo das listas de sugestões (palavra não encontrada) no cache persistente
+SUGGESTIONS_PREFIX = "suggestions|"
+
+# Status que indicam falha transitória do servidor (vale tentar de novo)
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class APIClient(metaclass=SingletonMeta):
+    """Cliente HTTP único do processo, compartilhado pelos services
+
+    Mantém uma Session com pool de conexões keep-alive (uma conexão TLS
+    quente para dictionaryapi.com) e um único namespace de cache. Falhas
+    transitórias são repetidas com backoff e, se persistirem, abrem o
+    circuit breaker para que os próximos fetches falhem sem esperar timeout.
+
+    O cache em memória é um LRU de MEMORY_CACHE_SIZE respostas: batch, export
+    e prefetch passam por milhares de palavras e o resto já fica no
+    ResponseCache em disco.
+    """
+
+    MEMORY_CACHE_SIZE = 128
 
-class APIClient:
     def __init__(self):
-        self._cache: Dict[str, Any] = {}
+        self._cache: "OrderedDict[str, Any]" = OrderedDict()
+        self._persistent_cache: Optional[ResponseCache] = None
+        self._persistent_loaded = False
+        self._negative_cache: "OrderedDict[str, float]" = OrderedDict()
+        self._suggestions: "OrderedDict[str, List[str]]" = OrderedDict()
+        self._breaker: Optional[CircuitBreaker] = None
+        self._session = None
+        self._init_lock = Lock()
+        self._cache_lock = Lock()
+        self._timings = Timings()
 
-    def fetch(self, url: str, cache_key: str) -> Optional[List[Dict]]:
+    def fetch(self, url: str, cache_key: str, priority: int = PRIORITY_USER) -> Optional[List[Dict]]:
 
-        if cache_key in self._cache:
-            return self._cache[cache_key]
+        with self._cache_lock:
+            hit = cache_key in self._cache
+            if hit:
+                self._cache.move_to_end(cache_key)
+                cached = self._cache[cache_key]
+        if hit:
+            self._timings.count("cache hits (memory)")
+            return cached
 
-        try:
-            resp = request("GET", url)
+        # Falha transitória recente: não insiste até o TTL negativo expirar
+        retry_at = self._negative_cache.get(cache_key)
+        if retry_at is not None:
+            if time.monotonic() < retry_at:
+                self._timings.count("cache hits (negative)")
+                return None
+            with self._cache_lock:
+                self._negative_cache.pop(cache_key, None)
 
+        # Cache em disco: evita round trip para palavras já buscadas
+        persistent = self._get_persistent_cache()
+        if persistent is not None:
+            cached = persistent.get(cache_key)
+            if cached is not None:
+                self._timings.count("cache hits (disk)")
+                self._remember(self._cache, cache_key, cached)
+                return cached
+
+            # Palavra que a API já disse não existir (com sugestões): sem novo GET
+            suggestions = persistent.get(SUGGESTIONS_PREFIX + cache_key)
+            if suggestions is not None:
+                self._timings.count("cache hits (disk)")
+                self._remember(self._suggestions, cache_key, suggestions)
+                self._remember(self._cache, cache_key, None)
+                return None
+
+        self._timings.count("cache misses")
+
+        resp = self._request(url, priority)
+        if resp is None:
+            # Falha transitória (timeout, 5xx, circuito aberto): cache negativo curto,
+            # separado do cache de respostas para não virar um "sem resultados" permanente
+            negative_ttl = float(self._get_setting("Negative Cache TTL", 60))
+            if negative_ttl > 0:
+                self._remember(self._negative_cache, cache_key, time.monotonic() + negative_ttl)
+            return None
+
+        try:
             if resp.status_code != 200 or not resp.text.strip():
-                self._cache[cache_key] = None
+                self._remember(self._cache, cache_key, None)
                 return None
 
             data = resp.json()
+        except ValueError:
+            self._remember(self._cache, cache_key, None)
+            return None
+
+        if isinstance(data, list) and data and isinstance(data[0], dict):
+            self._remember(self._cache, cache_key, data)
+            if persistent is not None:
+                persistent.set(cache_key, data)
+            return data
 
+        # Palavra não encontrada: a API devolve uma lista (talvez vazia) de sugestões
+        if isinstance(data, list) and all(isinstance(item, str) for item in data):
+            self._remember(self._suggestions, cache_key, data)
+            if persistent is not None:
+                persistent.set(SUGGESTIONS_PREFIX + cache_key, data)
 
-            if isinstance(data, list) and data and isinstance(data[0], dict):
-                self._cache[cache_key] = data
-                return data
+        self._remember(self._cache, cache_key, None)
+        return None
 
-            self._cache[cache_key] = None
+    def get_suggestions(self, cache_key: str) -> List[str]:
+        """Sugestões que a API devolveu no último fetch sem resultados da chave"""
+        return list(self._suggestions.get(cache_key, []))
+
+    def has_recent_failure(self, cache_key: str) -> bool:
+        """True se o fetch da chave falhou de forma transitória e ainda está no cache negativo"""
+        retry_at = self._negative_cache.get(cache_key)
+        return retry_at is not None and time.monotonic() < retry_at
+
+    def is_available(self) -> bool:
+        """False enquanto o circuit breaker estiver aberto (API fora do ar)"""
+        return self._get_breaker().state != CircuitBreaker.OPEN
+
+    def _request(self, url: str, priority: int = PRIORITY_USER):
+        """
+        GET com timeouts, retries com backoff exponencial (jitter) e circuit breaker.
+
+        Cada tentativa passa antes pelo QuotaScheduler (rate limit e limite
+        diário da chave, com prioridade para lookups do usuário). O breaker
+        conta uma falha por requisição, só depois de esgotar os retries: uma
+        palavra com 5xx persistente não abre o circuito para o resto do batch.
+
+        Returns:
+            Response definitiva (2xx/4xx), ou None em falha transitória
+        """
+        from requests import RequestException
+
+        breaker = self._get_breaker()
+        timeout = (float(self._get_setting("HTTP Connect Timeout", 3.05)),
+                   float(self._get_setting("HTTP Read Timeout", 10)))
+        retries = max(0, int(self._get_setting("HTTP Retries", 2)))
+        backoff = float(self._get_setting("HTTP Backoff", 0.5))
+        api_key = parse_qs(urlsplit(url).query).get("key", [""])[0]
+
+        if not breaker.allow():
+            self._timings.count("circuit open")
             return None
 
-        except Exception:
-            self._cache[cache_key] = None
-            return None
\ No newline at end of file
+        attempted = False
+        for attempt in range(retries + 1):
+            if attempt:
+                # Full jitter: evita que os workers do batch tentem todos ao mesmo tempo
+                self._timings.count("http retries")
+                time.sleep(random.uniform(0, backoff * 2 ** (attempt - 1)))
+
+            if not QuotaScheduler().acquire(api_key, priority):
+                break
+
+            attempted = True
+            try:
+                with self._timings.stage("http"):
+                    self._timings.count("http requests")
+                    resp = self._get_session().request("GET", url, timeout=timeout)
+            except RequestException:
+                continue
+
+            if resp.status_code in RETRY_STATUSES:
+                continue
+
+            breaker.record_success()
+            return resp
+
+        if attempted:
+            breaker.record_failure()
+        else:
+            # Nenhum GET feito (cota): não conta como falha nem prende o half-open
+            breaker.release()
+        return None
+
+    def _remember(self, store: "OrderedDict[str, Any]", key: str, value: Any) -> None:
+        """Guarda na memória, descartando o menos usado além de MEMORY_CACHE_SIZE"""
+        with self._cache_lock:
+            store[key] = value
+            store.move_to_end(key)
+            while len(store) > self.MEMORY_CACHE_SIZE:
+                store.popitem(last=False)
+
+    def _get_setting(self, key: str, default):
+        return ConfigManager().get_value(key, default)
+
+    def _get_breaker(self) -> CircuitBreaker:
+        """Cria o circuit breaker sob demanda conforme o config.toml"""
+        with self._init_lock:
+            if self._breaker is None:
+                self._breaker = CircuitBreaker(
+                    failure_threshold=int(self._get_setting("Circuit Breaker Threshold", 5)),
+                    reset_timeout=float(self._get_setting("Circuit Breaker Cooldown", 30))
+                )
+        return self._breaker
+
+    def _get_session(self):
+        """Cria a Session com pool de conexões sob demanda"""
+        with self._init_lock:
+            if self._session is None:
+                # requests é importado só no primeiro GET real (startup rápido)
+                from requests import Session
+                from requests.adapters import HTTPAdapter
+
+                pool_size = int(ConfigManager().get_value("HTTP Pool Size", 10))
+                adapter = HTTPAdapter(pool_connections=2, pool_maxsize=max(1, pool_size))
+                session = Session()
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self._session = session
+        return self._session
+
+    def _get_persistent_cache(self) -> Optional[ResponseCache]:
+        """Abre o cache persistente sob demanda conforme o config.toml"""
+        with self._init_lock:
+            if not self._persistent_loaded:
+                self._persistent_cache = ResponseCache.from_config(ConfigManager())
+                self._persistent_loaded = True
+        return self._persistent_cache
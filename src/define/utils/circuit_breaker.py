@@ -0,0 +1,72 @@
+import time
+from threading import Lock
+
+
+class CircuitBreaker:
+    """Circuit breaker para a API: falha rápido enquanto ela estiver fora do ar
+
+    closed    -> requisições passam; `failure_threshold` falhas seguidas abrem o circuito
+                 (uma falha por requisição, depois dos retries)
+    open      -> requisições são recusadas até passar `reset_timeout` segundos
+    half-open -> uma única requisição de teste passa; sucesso fecha, falha reabre
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                return self.HALF_OPEN
+            return self._state
+
+    def allow(self) -> bool:
+        """True se a requisição pode ser feita agora"""
+        if self.failure_threshold <= 0:
+            return True
+
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+
+            if self._state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.reset_timeout:
+                    return False
+                self._state = self.HALF_OPEN
+                self._probing = False
+
+            # Half-open: só uma requisição de teste por vez
+            if self._probing:
+                return False
+            self._probing = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probing = False
+
+    def release(self) -> None:
+        """Desiste de uma requisição liberada por allow() sem chegar a fazê-la (ex.: sem cota)"""
+        with self._lock:
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._probing = False
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold > 0:
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
@@ -1,19 +1,41 @@
 import os.path
 
-import tomli
-import tomli_w
-
 from define.utils.directory_manager import DirectoryManager
 from define.utils.singleton import SingletonMeta
 
 
 class ConfigManager(metaclass=SingletonMeta):
+    DEFAULTS = {
+        "THESAURUS KEY": "",
+        "DICTIONARY KEY":"",
+        "Dictionary URL":"https://dictionaryapi.com/api/v3/references/collegiate/json/",
+        "Thesaurus URL":"https://dictionaryapi.com/api/v3/references/thesaurus/json/",
+        "Cache Enabled": True,
+        "Cache TTL": 604800,
+        "Cache Max Entries": 5000,
+        "Batch Workers": 4,
+        "HTTP Pool Size": 10,
+        "HTTP Connect Timeout": 3.05,
+        "HTTP Read Timeout": 10,
+        "HTTP Retries": 2,
+        "HTTP Backoff": 0.5,
+        "Negative Cache TTL": 60,
+        "Circuit Breaker Threshold": 5,
+        "Circuit Breaker Cooldown": 30,
+        "Rate Limit": 10,
+        "Daily Request Limit": 1000,
+        "Quota Reserve": 100,
+        "Search Index Enabled": True
+    }
+
     def __init__(self):
         self.config_dir = DirectoryManager.get_config_directory()
         self.__data = dict()
 
     def read_config(self):
         if os.path.exists(f"{self.config_dir}/config.toml"):
+            import tomli
+
             try:
                 with open(f"{self.config_dir}/config.toml", "rb") as f:
                     data = tomli.load(f)
@@ -32,16 +54,9 @@ class ConfigManager(metaclass=SingletonMeta):
         self.__data.update(data)
 
     def write_config(self):
-        default = {
-            "THESAURUS KEY": "",
-            "DICTIONARY KEY":"",
-            "Dictionary URL":"https://dictionaryapi.com/api/v3/references/collegiate/json/",
-            "Thesaurus URL":"https://dictionaryapi.com/api/v3/references/thesaurus/json/"
-
+        import tomli_w
 
-        }
-
-        for key, default_value in default.items():
+        for key, default_value in self.DEFAULTS.items():
             current_value = self.__data.get(key)
             if current_value is None or current_value == "":
                 self.__data[key] = default_value
@@ -54,4 +69,10 @@ class ConfigManager(metaclass=SingletonMeta):
         if key in self.__data.keys():
             return {key:self.__data[key]}
         else:
-            return None
\ No newline at end of file
+            return None
+
+    def get_value(self, key, default=None):
+        """Retorna o valor bruto de uma chave, com fallback para DEFAULTS"""
+        if key in self.__data.keys():
+            return self.__data[key]
+        return self.DEFAULTS.get(key, default)
\ No newline at end of file
@@ -3,12 +3,18 @@ from pathlib import Path
 
 
 class DirectoryManager:
+    _config_dir = None
 
     @staticmethod
     def get_config_directory()-> Path:
+        if DirectoryManager._config_dir is not None:
+            return DirectoryManager._config_dir
+
         home = Path.home()
         config_dir = home / ".Define"
-        config_dir.mkdir(exist_ok=True)
-        os.chmod(config_dir,0o744)
+        if not config_dir.is_dir():
+            config_dir.mkdir(exist_ok=True)
+            os.chmod(config_dir,0o744)
 
+        DirectoryManager._config_dir = config_dir
         return config_dir
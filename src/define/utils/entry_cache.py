@@ -0,0 +1,29 @@
+import pickle
+from typing import Any
+
+from define.utils.response_cache import ResponseCache
+
+
+class EntryCache(ResponseCache):
+    """Cache persistente do resultado final de um lookup (entries já processadas e enriquecidas)
+
+    Mesmo banco, TTL e limite do ResponseCache, em outra tabela e serializado
+    com pickle: um hit devolve as Entry prontas, sem parsing, limpeza de
+    markup, cross-refs nem enriquecimento. O arquivo fica em ~/.Define, que só
+    o usuário grava.
+    """
+
+    TABLE = "entries"
+
+    def _encode(self, value: Any):
+        try:
+            return pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except pickle.PicklingError as e:
+            raise TypeError(e)
+
+    def _decode(self, raw) -> Any:
+        # Entrada gravada por uma versão incompatível dos models: trata como miss
+        try:
+            return pickle.loads(raw)
+        except Exception as e:
+            raise ValueError(e)
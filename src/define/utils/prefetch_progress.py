@@ -0,0 +1,55 @@
+import hashlib
+from pathlib import Path
+from typing import Optional, Set
+
+from define.utils.directory_manager import DirectoryManager
+
+
+class PrefetchProgress:
+    """Progresso retomável do --prefetch: uma palavra concluída por linha
+
+    Cada palavra é gravada (e o arquivo descarregado) assim que termina, então
+    uma execução interrompida continua de onde parou. Fica em
+    ~/.Define/prefetch/, identificado pelo caminho absoluto da lista.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._done: Optional[Set[str]] = None
+        self._file = None
+
+    @classmethod
+    def for_word_list(cls, source: str) -> Optional["PrefetchProgress"]:
+        """Progresso da lista `source` (None para stdin, que não dá para retomar)"""
+        if source == "-":
+            return None
+
+        digest = hashlib.sha1(str(Path(source).resolve()).encode("utf-8")).hexdigest()[:16]
+        directory = DirectoryManager.get_config_directory() / "prefetch"
+        directory.mkdir(exist_ok=True)
+        return cls(directory / f"{digest}.progress")
+
+    def is_done(self, word: str) -> bool:
+        if self._done is None:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self._done = {line.rstrip("\n") for line in f}
+            except FileNotFoundError:
+                self._done = set()
+        return word in self._done
+
+    def mark(self, word: str) -> None:
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._file.write(word + "\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def discard(self) -> None:
+        """Lista concluída sem falhas: a próxima execução começa do zero"""
+        self.close()
+        self.path.unlink(missing_ok=True)
@@ -0,0 +1,68 @@
+from bisect import bisect_left, insort
+from threading import Lock
+from typing import Dict, List
+
+from define.utils.singleton import SingletonMeta
+from define.utils.vocabulary import Vocabulary
+
+
+class PrefixIndex(metaclass=SingletonMeta):
+    """Array ordenado (bisect) das palavras do Vocabulary para autocomplete
+
+    Cada consulta é uma busca binária + varredura só dos casamentos, então
+    responde em microssegundos mesmo com vocabulários grandes. Palavras novas
+    do Vocabulary entram a cada consulta. A comparação ignora maiúsculas.
+    """
+
+    # Acima disso, reordenar tudo sai mais barato que insort uma a uma
+    BULK_INSERT = 32
+
+    def __init__(self):
+        self.vocabulary = Vocabulary()
+        self._keys: List[str] = []
+        self._spellings: Dict[str, str] = {}
+        self._synced = 0
+        self._lock = Lock()
+
+    def complete(self, prefix: str, limit: int = 100) -> List[str]:
+        """
+        Palavras conhecidas que começam com `prefix`, em ordem alfabética.
+
+        Args:
+            prefix: Início da palavra digitada
+            limit: Máximo de palavras devolvidas
+
+        Returns:
+            Palavras completas (com a grafia original)
+        """
+        key = prefix.lower()
+
+        with self._lock:
+            self._sync()
+
+            keys = self._keys
+            results = []
+            i = bisect_left(keys, key)
+            while i < len(keys) and len(results) < limit and keys[i].startswith(key):
+                results.append(self._spellings[keys[i]])
+                i += 1
+            return results
+
+    def _sync(self) -> None:
+        """Insere as palavras que o Vocabulary ganhou (chamar com o lock)"""
+        new_words = self.vocabulary.words(self._synced)
+        self._synced += len(new_words)
+
+        fresh = []
+        for spelling in new_words:
+            key = spelling.lower()
+            if key not in self._spellings:
+                self._spellings[key] = spelling
+                fresh.append(key)
+
+        if len(fresh) > self.BULK_INSERT:
+            self._keys.extend(fresh)
+            self._keys.sort()
+        else:
+            for key in fresh:
+                insort(self._keys, key)
@@ -0,0 +1,143 @@
+import hashlib
+import sqlite3
+import time
+from threading import Condition
+from typing import Dict, List, Set, Tuple
+
+from define.utils.config_manager import ConfigManager
+from define.utils.singleton import SingletonMeta
+from define.utils.sqlite_connection import SQLiteConnection
+from define.utils.timings import Timings
+
+# Prioridades de fetch: lookups pedidos pelo usuário passam na frente de
+# trabalho de fundo (resolução de cross-refs)
+PRIORITY_USER = 0
+PRIORITY_BACKGROUND = 1
+
+
+class QuotaScheduler(metaclass=SingletonMeta):
+    """Token bucket por chave de API + contador diário persistido em ~/.Define/quota.db
+
+    O rate limit (token bucket) vale para o processo; o contador diário é
+    compartilhado entre processos (CLI, batch, daemon) via SQLite. Trabalho
+    de fundo só consome o orçamento enquanto sobrarem mais de `Quota Reserve`
+    requisições no dia, e espera os lookups do usuário na fila do bucket.
+    """
+
+    def __init__(self):
+        config = ConfigManager()
+        self.rate = float(config.get_value("Rate Limit", 10))
+        self.daily_limit = int(config.get_value("Daily Request Limit", 1000))
+        self.reserve = int(config.get_value("Quota Reserve", 100))
+        self.path = config.config_dir / "quota.db"
+
+        self._db = SQLiteConnection(self.path, [
+            "CREATE TABLE IF NOT EXISTS usage ("
+            "key_id TEXT NOT NULL, day TEXT NOT NULL, count INTEGER NOT NULL, "
+            "PRIMARY KEY (key_id, day))"
+        ])
+        self._buckets: Dict[str, List[float]] = {}
+        self._bucket_cond = Condition()
+        self._waiting_users = 0
+        self._exhausted: Set[Tuple[str, str]] = set()
+        self._timings = Timings()
+
+    def acquire(self, api_key: str, priority: int = PRIORITY_USER) -> bool:
+        """
+        Reserva uma requisição para a chave, esperando o rate limit se preciso.
+
+        Args:
+            api_key: Chave de API usada na requisição
+            priority: PRIORITY_USER ou PRIORITY_BACKGROUND
+
+        Returns:
+            False se o orçamento diário (para esta prioridade) acabou
+        """
+        key_id = self._key_id(api_key)
+
+        if not self._consume_daily(key_id, priority):
+            self._timings.count("quota denied")
+            return False
+
+        with self._timings.stage("quota wait"):
+            self._take_token(key_id, priority)
+        return True
+
+    def is_exhausted(self) -> bool:
+        """True se algum lookup do usuário foi negado pelo limite diário hoje"""
+        today = self._today()
+        return any(day == today for _, day in self._exhausted)
+
+    def usage(self, api_key: str) -> int:
+        """Requisições já feitas hoje com a chave"""
+        try:
+            with self._db.lock:
+                row = self._db.connect().execute(
+                    "SELECT count FROM usage WHERE key_id = ? AND day = ?",
+                    (self._key_id(api_key), self._today())
+                ).fetchone()
+        except sqlite3.Error:
+            return 0
+        return row[0] if row else 0
+
+    def _consume_daily(self, key_id: str, priority: int) -> bool:
+        """Incrementa o contador do dia de forma atômica (entre processos) se houver orçamento"""
+        if self.daily_limit <= 0:
+            return True
+
+        limit = self.daily_limit
+        if priority != PRIORITY_USER:
+            limit -= self.reserve
+
+        day = self._today()
+        try:
+            with self._db.lock:
+                conn = self._db.connect()
+                conn.execute("INSERT OR IGNORE INTO usage (key_id, day, count) VALUES (?, ?, 0)", (key_id, day))
+                cursor = conn.execute(
+                    "UPDATE usage SET count = count + 1 WHERE key_id = ? AND day = ? AND count < ?",
+                    (key_id, day, limit)
+                )
+        except sqlite3.Error:
+            # Sem contador persistido não bloqueia os lookups
+            return True
+
+        if cursor.rowcount == 0:
+            if priority == PRIORITY_USER:
+                self._exhausted.add((key_id, day))
+            return False
+        return True
+
+    def _take_token(self, key_id: str, priority: int) -> None:
+        """Espera um token do bucket da chave; fundo só pega token sem usuário esperando"""
+        if self.rate <= 0:
+            return
+
+        with self._bucket_cond:
+            is_user = priority == PRIORITY_USER
+            if is_user:
+                self._waiting_users += 1
+
+            try:
+                bucket = self._buckets.setdefault(key_id, [self.rate, time.monotonic()])
+                while True:
+                    now = time.monotonic()
+                    bucket[0] = min(self.rate, bucket[0] + (now - bucket[1]) * self.rate)
+                    bucket[1] = now
+
+                    if bucket[0] >= 1 and (is_user or self._waiting_users == 0):
+                        bucket[0] -= 1
+                        return
+
+                    self._bucket_cond.wait(max((1 - bucket[0]) / self.rate, 0.001))
+            finally:
+                if is_user:
+                    self._waiting_users -= 1
+                self._bucket_cond.notify_all()
+
+    def _key_id(self, api_key: str) -> str:
+        # Não grava a chave em si no banco
+        return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+
+    def _today(self) -> str:
+        return time.strftime("%Y-%m-%d", time.gmtime())
@@ -0,0 +1,72 @@
+import sqlite3
+from typing import Dict, Optional
+
+from define.utils.config_manager import ConfigManager
+from define.utils.singleton import SingletonMeta
+from define.utils.sqlite_connection import SQLiteConnection
+
+
+class RefStore(metaclass=SingletonMeta):
+    """Tabela persistente de cross-refs já resolvidas (ref -> headword) (tabela refs de ~/.Define/cache.db)
+
+    Compartilhada por todos os TextProcessor e processos; cada service usa o
+    seu namespace ("dict", "thes"). O namespace é carregado inteiro na
+    primeira consulta e os misses ainda olham o banco, onde outro processo
+    pode ter gravado a ref nesse meio tempo.
+    """
+
+    def __init__(self):
+        config = ConfigManager()
+        self.enabled = bool(config.get_value("Cache Enabled", True))
+        self.path = config.config_dir / "cache.db"
+        self._db = SQLiteConnection(self.path, [
+            "CREATE TABLE IF NOT EXISTS refs ("
+            "namespace TEXT NOT NULL, ref TEXT NOT NULL, headword TEXT NOT NULL, "
+            "PRIMARY KEY (namespace, ref))"
+        ])
+        self._loaded: Dict[str, Dict[str, str]] = {}
+
+    def get(self, namespace: str, ref_word: str) -> Optional[str]:
+        """Headword gravado para a ref, ou None se ela nunca foi resolvida"""
+        if not self.enabled:
+            return None
+
+        try:
+            with self._db.lock:
+                refs = self._load(namespace)
+                resolved = refs.get(ref_word)
+                if resolved is None:
+                    row = self._db.connect().execute(
+                        "SELECT headword FROM refs WHERE namespace = ? AND ref = ?", (namespace, ref_word)
+                    ).fetchone()
+                    if row is not None:
+                        resolved = refs[ref_word] = row[0]
+        except sqlite3.Error:
+            return None
+
+        return resolved
+
+    def set(self, namespace: str, ref_word: str, headword: str) -> None:
+        """Grava uma ref resolvida com sucesso"""
+        if not self.enabled:
+            return
+
+        try:
+            with self._db.lock:
+                self._load(namespace)[ref_word] = headword
+                self._db.connect().execute(
+                    "INSERT OR REPLACE INTO refs (namespace, ref, headword) VALUES (?, ?, ?)",
+                    (namespace, ref_word, headword)
+                )
+        except sqlite3.Error:
+            return
+
+    def _load(self, namespace: str) -> Dict[str, str]:
+        """Carrega o namespace na primeira consulta (chamar com o lock adquirido)"""
+        refs = self._loaded.get(namespace)
+        if refs is None:
+            rows = self._db.connect().execute(
+                "SELECT ref, headword FROM refs WHERE namespace = ?", (namespace,)
+            ).fetchall()
+            refs = self._loaded[namespace] = dict(rows)
+        return refs
@@ -0,0 +1,123 @@
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+from define.utils.sqlite_connection import SQLiteConnection
+
+
+class ResponseCache:
+    """Cache persistente (SQLite) de respostas da API com TTL e despejo LRU"""
+
+    TABLE = "responses"
+
+    def __init__(self, path: Path, ttl: int, max_entries: int):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._db = SQLiteConnection(path, [
+            f"CREATE TABLE IF NOT EXISTS {self.TABLE} ("
+            f"key TEXT PRIMARY KEY, value BLOB NOT NULL, "
+            f"created_at REAL NOT NULL, accessed_at REAL NOT NULL)",
+            f"CREATE INDEX IF NOT EXISTS {self.TABLE}_accessed ON {self.TABLE} (accessed_at)",
+        ])
+
+    @classmethod
+    def from_config(cls, config, filename: str = "cache.db") -> Optional["ResponseCache"]:
+        """Cria o cache a partir do config.toml (None se desabilitado)"""
+        if not config.get_value("Cache Enabled", True):
+            return None
+
+        return cls(
+            config.config_dir / filename,
+            ttl=int(config.get_value("Cache TTL", 0)),
+            max_entries=int(config.get_value("Cache Max Entries", 0))
+        )
+
+    def get(self, key: str) -> Optional[Any]:
+        """Busca entrada válida; atualiza o timestamp de acesso (LRU)"""
+        now = time.time()
+        try:
+            with self._db.lock:
+                conn = self._db.connect()
+                row = conn.execute(
+                    f"SELECT value, created_at FROM {self.TABLE} WHERE key = ?", (key,)
+                ).fetchone()
+
+                if row is None:
+                    return None
+
+                if self.ttl > 0 and now - row[1] > self.ttl:
+                    conn.execute(f"DELETE FROM {self.TABLE} WHERE key = ?", (key,))
+                    return None
+
+                conn.execute(f"UPDATE {self.TABLE} SET accessed_at = ? WHERE key = ?", (now, key))
+
+            return self._decode(row[0])
+        except (sqlite3.Error, ValueError):
+            return None
+
+    def set(self, key: str, value: Any) -> None:
+        """Grava entrada e despeja as menos usadas se passar do limite"""
+        now = time.time()
+        try:
+            encoded = self._encode(value)
+            with self._db.lock:
+                conn = self._db.connect()
+                conn.execute(
+                    f"INSERT OR REPLACE INTO {self.TABLE} (key, value, created_at, accessed_at) "
+                    f"VALUES (?, ?, ?, ?)",
+                    (key, encoded, now, now)
+                )
+                self._evict(conn)
+        except (sqlite3.Error, TypeError, ValueError):
+            return
+
+    def iter_values(self) -> Iterator[Any]:
+        """Percorre os valores guardados, um por vez (não mexe no LRU nem no TTL)"""
+        try:
+            with self._db.lock:
+                rowids = [row[0] for row in self._db.connect().execute(f"SELECT rowid FROM {self.TABLE}")]
+        except sqlite3.Error:
+            return
+
+        for rowid in rowids:
+            try:
+                with self._db.lock:
+                    row = self._db.connect().execute(
+                        f"SELECT value FROM {self.TABLE} WHERE rowid = ?", (rowid,)
+                    ).fetchone()
+                if row is not None:
+                    yield self._decode(row[0])
+            except (sqlite3.Error, ValueError):
+                continue
+
+    def clear(self) -> None:
+        """Remove todas as entradas"""
+        try:
+            with self._db.lock:
+                self._db.connect().execute(f"DELETE FROM {self.TABLE}")
+        except sqlite3.Error:
+            return
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        """Despeja as entradas acessadas há mais tempo (LRU)"""
+        if self.max_entries <= 0:
+            return
+
+        count = conn.execute(f"SELECT COUNT(*) FROM {self.TABLE}").fetchone()[0]
+        if count <= self.max_entries:
+            return
+
+        conn.execute(
+            f"DELETE FROM {self.TABLE} WHERE key IN "
+            f"(SELECT key FROM {self.TABLE} ORDER BY accessed_at ASC LIMIT ?)",
+            (count - self.max_entries,)
+        )
+
+    def _encode(self, value: Any):
+        return json.dumps(value, separators=(",", ":"))
+
+    def _decode(self, raw) -> Any:
+        return json.loads(raw)
@@ -0,0 +1,115 @@
+import sqlite3
+from typing import Iterable, List, Optional, Tuple
+
+from define.utils.config_manager import ConfigManager
+from define.utils.singleton import SingletonMeta
+from define.utils.sqlite_connection import SQLiteConnection
+
+# Marcadores do snippet() (caracteres de controle não aparecem nas definições)
+MATCH_START = "\x02"
+MATCH_END = "\x03"
+
+
+class SearchIndex(metaclass=SingletonMeta):
+    """Índice full-text (SQLite FTS5) das definições já processadas (dicionário reverso)"""
+
+    def __init__(self):
+        config = ConfigManager()
+        self.enabled = bool(config.get_value("Search Index Enabled", True))
+        self.path = config.config_dir / "search.db"
+        # Sem autocommit: index_entries grava cada lote numa transação só
+        self._db = SQLiteConnection(self.path, [
+            "CREATE VIRTUAL TABLE IF NOT EXISTS definitions USING fts5("
+            "headword UNINDEXED, homonym UNINDEXED, part_of_speech UNINDEXED, field UNINDEXED, "
+            "content, tokenize = 'porter unicode61')",
+            "CREATE TABLE IF NOT EXISTS indexed_entries (key TEXT PRIMARY KEY)",
+        ], autocommit=False)
+        self._available = True
+
+    def index_entries(self, entries: Iterable) -> None:
+        """Indexa definições, exemplos e short_summary de Entry objects ainda não indexados"""
+        if not self.enabled:
+            return
+
+        try:
+            with self._db.lock:
+                conn = self._connect()
+                if conn is None:
+                    return
+
+                with conn:
+                    for entry in entries:
+                        self._index_entry(conn, entry)
+        except sqlite3.Error:
+            return
+
+    def search(self, phrase: str, limit: int = 20) -> Optional[List[Tuple[str, str, str]]]:
+        """
+        Busca a frase no índice.
+
+        Args:
+            phrase: Frase/termo a buscar
+            limit: Máximo de headwords retornados
+
+        Returns:
+            Lista de (headword, part_of_speech, snippet) por relevância,
+            ou None se o índice não estiver disponível (FTS5 ausente)
+        """
+        query = '"' + phrase.replace('"', '""') + '"'
+
+        try:
+            with self._db.lock:
+                conn = self._connect()
+                if conn is None:
+                    return None
+
+                rows = conn.execute(
+                    f"SELECT headword, part_of_speech, "
+                    f"snippet(definitions, 4, '{MATCH_START}', '{MATCH_END}', '…', 16) "
+                    f"FROM definitions WHERE definitions MATCH ? ORDER BY rank LIMIT ?",
+                    (query, limit * 5)
+                ).fetchall()
+        except sqlite3.Error:
+            return None
+
+        # Uma linha por headword (a mais relevante)
+        results = []
+        seen = set()
+        for headword, part_of_speech, snippet in rows:
+            if headword in seen:
+                continue
+            seen.add(headword)
+            results.append((headword, part_of_speech, snippet))
+            if len(results) >= limit:
+                break
+
+        return results
+
+    def _index_entry(self, conn: sqlite3.Connection, entry) -> None:
+        key = f"{entry.headword}|{entry.homonym_num}|{entry.part_of_speech}"
+        cursor = conn.execute("INSERT OR IGNORE INTO indexed_entries (key) VALUES (?)", (key,))
+        if cursor.rowcount == 0:
+            return  # Já indexado
+
+        rows = []
+        for definition in entry.definitions:
+            rows.append(("definition", definition.text))
+            rows.extend(("example", example) for example in definition.examples)
+        rows.extend(("summary", summary) for summary in entry.short_summary)
+
+        conn.executemany(
+            "INSERT INTO definitions (headword, homonym, part_of_speech, field, content) VALUES (?, ?, ?, ?, ?)",
+            [(entry.headword, str(entry.homonym_num), entry.part_of_speech, field, text)
+             for field, text in rows if text]
+        )
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        """Abre o índice sob demanda (chamar com o lock adquirido); None sem FTS5"""
+        if not self._available:
+            return None
+        try:
+            return self._db.connect()
+        except sqlite3.OperationalError:
+            # SQLite compilado sem FTS5
+            self._available = False
+            return None
\ No newline at end of file
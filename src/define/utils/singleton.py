@@ -1,9 +1,10 @@
-from threading import Lock
+from threading import RLock
 
 
 class SingletonMeta(type):
     _instances = {}
-    _lock: Lock = Lock()
+    # RLock: um singleton pode instanciar outro (ex.: ConfigManager) no __init__
+    _lock: RLock = RLock()
 
     def __call__(cls, *args, **kwargs):
         with cls._lock:
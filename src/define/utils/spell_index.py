@@ -0,0 +1,129 @@
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+
+from define.utils.singleton import SingletonMeta
+from define.utils.vocabulary import Vocabulary
+
+
+def edit_distance(a: str, b: str) -> int:
+    """Distância de Levenshtein (inserção, remoção e troca custam 1)"""
+    return _distance(_pattern(a), b)
+
+
+def _pattern(word: str) -> Tuple[Dict[str, int], int]:
+    """Máscaras de bits por caractere de `word` (pré-calculadas uma vez por consulta/inserção)"""
+    masks: Dict[str, int] = {}
+    for i, char in enumerate(word):
+        masks[char] = masks.get(char, 0) | (1 << i)
+    return masks, len(word)
+
+
+def _distance(pattern: Tuple[Dict[str, int], int], text: str) -> int:
+    """Levenshtein bit-paralelo (Myers/Hyyrö): uma passada por caractere de `text`"""
+    masks, length = pattern
+    if not length:
+        return len(text)
+
+    full = (1 << length) - 1
+    last = 1 << (length - 1)
+    pv, mv, score = full, 0, length
+
+    for char in text:
+        eq = masks.get(char, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | (~(xh | pv) & full)
+        mh = pv & xh
+
+        if ph & last:
+            score += 1
+        elif mh & last:
+            score -= 1
+
+        ph = ((ph << 1) | 1) & full
+        mh = (mh << 1) & full
+        pv = mh | (~(xv | ph) & full)
+        mv = ph & xv
+
+    return score
+
+
+class SpellIndex(metaclass=SingletonMeta):
+    """BK-tree sobre o Vocabulary: sugestões "did you mean" sem chamar a API
+
+    A árvore é montada na primeira consulta e recebe as palavras novas do
+    Vocabulary a cada consulta seguinte. A comparação ignora maiúsculas.
+    """
+
+    def __init__(self):
+        self.vocabulary = Vocabulary()
+        # Nó: [palavra minúscula, {distância: nó filho}]
+        self._root: Optional[list] = None
+        self._spellings: Dict[str, str] = {}
+        self._synced = 0
+        self._lock = Lock()
+
+    def suggest(self, word: str, max_distance: int = 2, limit: int = 5) -> List[str]:
+        """
+        Palavras conhecidas mais próximas de `word`.
+
+        Args:
+            word: Palavra (provavelmente com erro de grafia)
+            max_distance: Distância de edição máxima aceita
+            limit: Máximo de sugestões
+
+        Returns:
+            Sugestões ordenadas por distância e depois alfabeticamente
+        """
+        query = word.strip().lower()
+        if not query:
+            return []
+
+        with self._lock:
+            self._sync()
+            if self._root is None:
+                return []
+
+            pattern = _pattern(query)
+            matches = []
+            stack = [self._root]
+            while stack:
+                key, children = stack.pop()
+                distance = _distance(pattern, key)
+                if 0 < distance <= max_distance:
+                    matches.append((distance, key))
+
+                # Desigualdade triangular: só filhos em [d - max, d + max] podem casar
+                for child_distance, child in children.items():
+                    if distance - max_distance <= child_distance <= distance + max_distance:
+                        stack.append(child)
+
+            matches.sort()
+            return [self._spellings[key] for _, key in matches[:limit]]
+
+    def _sync(self) -> None:
+        """Insere na árvore as palavras que o Vocabulary ganhou (chamar com o lock)"""
+        new_words = self.vocabulary.words(self._synced)
+        self._synced += len(new_words)
+
+        for spelling in new_words:
+            key = spelling.lower()
+            if key in self._spellings:
+                continue
+            self._spellings[key] = spelling
+            self._insert(key)
+
+    def _insert(self, key: str) -> None:
+        if self._root is None:
+            self._root = [key, {}]
+            return
+
+        pattern = _pattern(key)
+        node = self._root
+        while True:
+            distance = _distance(pattern, node[0])
+            child = node[1].get(distance)
+            if child is None:
+                node[1][distance] = [key, {}]
+                return
+            node = child
@@ -0,0 +1,42 @@
+import sqlite3
+from pathlib import Path
+from threading import Lock
+from typing import Iterable, Optional
+
+
+class SQLiteConnection:
+    """Conexão SQLite aberta sob demanda e compartilhada pelas threads do processo
+
+    Base dos bancos em ~/.Define: o arquivo só é aberto (em modo WAL, para
+    vários processos lerem e gravarem juntos) e o schema criado no primeiro
+    uso. Quem usa a conexão segura o `lock`, que também pode proteger o
+    estado em memória do store.
+    """
+
+    def __init__(self, path: Path, schema: Iterable[str], autocommit: bool = True):
+        """
+        Args:
+            path: Arquivo do banco
+            schema: CREATE ... IF NOT EXISTS executados ao abrir
+            autocommit: False para agrupar gravações com `with conn:`
+        """
+        self.path = path
+        self.schema = tuple(schema)
+        self.autocommit = autocommit
+        self.lock = Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def connect(self) -> sqlite3.Connection:
+        """Abre a conexão na primeira chamada (chamar com o lock adquirido)"""
+        if self._conn is None:
+            conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=5,
+                                   isolation_level=None if self.autocommit else "")
+            try:
+                conn.execute("PRAGMA journal_mode=WAL")
+                for statement in self.schema:
+                    conn.execute(statement)
+            except sqlite3.Error:
+                conn.close()
+                raise
+            self._conn = conn
+        return self._conn
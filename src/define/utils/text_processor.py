@@ -1,41 +1,142 @@
 import re
-from typing import Set, Dict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Set, Dict, Iterable, Optional
+
+from define.utils.timings import Timings
+
+# Tokenizer de passada única: cada {tag|...} é casado uma vez só.
+#   grupo 1 -> {dxt|...}            (cross-ref, resolvida)
+#   grupo 2 -> {d_link|texto|...}   (mantém o texto)
+#   demais  -> {qualquer tag}       (removida)
+_MARKUP_TOKEN = re.compile(r'\{(?:dxt\|([^{}]*)|d_link\|([^{}|]+)\|[^{}]*|[^{}]*)\}')
+
+# Cadeia original, usada só como fallback para markup aninhado/desbalanceado
+_DXT_PATTERN = re.compile(r'\{dxt\|([^}]*)\}')
+_D_LINK_PATTERN = re.compile(r'\{d_link\|([^|}]+)\|[^}]*\}')
+_DX_PATTERN = re.compile(r'\{\/?dx[^}]*\}')
+_TAG_PATTERN = re.compile(r'\{[^}]*\}')
+
 
 class TextProcessor:
     """Limpa markup Merriam-Webster"""
 
-    def __init__(self, api_client):
+    # Máximo de cross-refs resolvidas em paralelo por prefetch_refs()
+    max_prefetch_workers = 8
+
+    def __init__(self, api_client, ref_store=None, namespace: str = ""):
         self.api_client = api_client
+        # RefStore persistente (opcional), consultado antes do resolver do service
+        self.ref_store = ref_store
+        self.namespace = namespace
         self._resolved_refs: Dict[str, str] = {}
+        self.timings = Timings()
 
     def clean_text(self, text: str) -> str:
         """Remove markup MW e resolve cross-refs"""
+        if '{' not in text:
+            return text.strip()
+
+        cleaned = _MARKUP_TOKEN.sub(self._replace_token, text)
+
+        # Sobrou '{': markup aninhado ou desbalanceado, usa a cadeia original
+        if '{' in cleaned:
+            return self._clean_text_chain(text)
+
+        return cleaned.strip()
+
+    def _replace_token(self, match) -> str:
+        """Substitui um token de markup casado por _MARKUP_TOKEN"""
+        dxt_inner = match.group(1)
+        if dxt_inner is not None:
+            parts = dxt_inner.split('|')
+            if len(parts) > 1:
+                return self._get_ref(parts[1].split(':')[0])
+            return dxt_inner
+
+        link_text = match.group(2)
+        if link_text is not None:
+            return link_text
+
+        return ''
+
+    def _clean_text_chain(self, text: str) -> str:
+        """Limpeza em passadas sucessivas (comportamento de referência)"""
         text = self._resolve_cross_refs(text)
-        text = re.sub(r'\{d_link\|([^|}]+)\|[^}]*\}', r'\1', text)
-        text = re.sub(r'\{\/?dx[^}]*\}', '', text)
-        text = re.sub(r'\{[^}]*\}', '', text)
+        text = _D_LINK_PATTERN.sub(r'\1', text)
+        text = _DX_PATTERN.sub('', text)
+        text = _TAG_PATTERN.sub('', text)
         return text.strip()
 
     def _resolve_cross_refs(self, text: str) -> str:
         """Resolve {dxt|...} references"""
-        pattern = re.compile(r'\{dxt\|([^}]*)\}')
+        pattern = _DXT_PATTERN
         refs = self._extract_refs(text, pattern)
 
         # Resolve refs que ainda não foram resolvidas
         for ref in refs:
-            if ref not in self._resolved_refs:
-                self._resolved_refs[ref] = self._fetch_ref(ref)
+            self._get_ref(ref)
 
         def replacement(match):
             inner = match.group(1)
             parts = inner.split('|')
             if len(parts) > 1:
-                ref_word = parts[1].split(':')[0]
-                return self._resolved_refs.get(ref_word, ref_word)
+                return self._get_ref(parts[1].split(':')[0])
             return inner
 
         return pattern.sub(replacement, text)
 
+    def prefetch_refs(self, texts: Iterable[str]) -> None:
+        """Coleta as cross-refs de todos os textos e resolve as pendentes em lote paralelo"""
+        pattern = _DXT_PATTERN
+        refs = set()
+        for text in texts:
+            if '{dxt|' in text:
+                refs |= self._extract_refs(text, pattern)
+
+        pending = [ref for ref in refs if ref not in self._resolved_refs and not self._load_stored_ref(ref)]
+        if not pending:
+            return
+
+        with self.timings.stage("cross-ref resolution"):
+            if len(pending) == 1:
+                self._fetch_and_store_ref(pending[0])
+                return
+
+            workers = min(self.max_prefetch_workers, len(pending))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="define-refs") as pool:
+                list(pool.map(self._fetch_and_store_ref, pending))
+
+    def _get_ref(self, ref_word: str) -> str:
+        """Headword da cross-ref: memória -> RefStore -> resolver; na falha, a própria ref"""
+        if ref_word not in self._resolved_refs and not self._load_stored_ref(ref_word):
+            with self.timings.stage("cross-ref resolution"):
+                self._fetch_and_store_ref(ref_word)
+        return self._resolved_refs.get(ref_word, ref_word)
+
+    def _load_stored_ref(self, ref_word: str) -> bool:
+        """Traz a ref do RefStore para a memória; False se ela não estiver lá"""
+        if self.ref_store is None:
+            return False
+
+        resolved = self.ref_store.get(self.namespace, ref_word)
+        if resolved is None:
+            return False
+
+        self.timings.count("cross-refs (stored)")
+        self._resolved_refs[ref_word] = resolved
+        return True
+
+    def _fetch_and_store_ref(self, ref_word: str) -> Optional[str]:
+        """Chama o resolver; só resoluções bem-sucedidas são memorizadas e persistidas"""
+        resolved = self._fetch_ref(ref_word)
+        if resolved is None:
+            return None
+
+        self._resolved_refs[ref_word] = resolved
+        if self.ref_store is not None:
+            self.ref_store.set(self.namespace, ref_word, resolved)
+        return resolved
+
     def _extract_refs(self, text: str, pattern) -> Set[str]:
         """Extrai referências do texto"""
         refs = set()
@@ -46,8 +147,8 @@ class TextProcessor:
                 refs.add(ref_word)
         return refs
 
-    def _fetch_ref(self, ref_word: str) -> str:
-        """Busca uma referência via API - precisa ser implementado pelo service"""
+    def _fetch_ref(self, ref_word: str) -> Optional[str]:
+        """Busca uma referência via API - precisa ser implementado pelo service (None se falhar)"""
         # Isso será chamado pelo DictionaryService que tem acesso ao API
         return ref_word
 
@@ -0,0 +1,84 @@
+from contextlib import contextmanager, nullcontext
+from threading import Lock
+from time import perf_counter
+from typing import Dict, Iterable, Iterator, List, Tuple, TypeVar
+
+from define.utils.singleton import SingletonMeta
+
+_DISABLED = nullcontext()
+
+T = TypeVar("T")
+
+
+class Timings(metaclass=SingletonMeta):
+    """Coletor de latência por estágio e contadores do hot path (--timings)
+
+    Desligado por padrão: stage() devolve um contexto vazio e count() não faz
+    nada, então a instrumentação custa quase zero fora do --timings.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._stages: Dict[str, List[float]] = {}
+        self._counters: Dict[str, int] = {}
+        self._lock = Lock()
+
+    def stage(self, name: str):
+        """Context manager que soma o wall-clock do bloco no estágio `name`"""
+        if not self.enabled:
+            return _DISABLED
+        return self._measure(name)
+
+    def iter_stage(self, name: str, iterable: Iterable[T]) -> Iterator[T]:
+        """
+        stage() para geradores: soma no estágio `name` só o tempo gasto produzindo
+        cada item, não o do consumidor entre um item e outro (uma chamada no total).
+        """
+        if not self.enabled:
+            return iter(iterable)
+        return self._measure_iter(name, iterable)
+
+    def count(self, name: str, amount: int = 1) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def stages(self) -> List[Tuple[str, float, int]]:
+        """(estágio, segundos, chamadas) na ordem em que apareceram"""
+        with self._lock:
+            return [(name, total, calls) for name, (total, calls) in self._stages.items()]
+
+    def counters(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counters)
+
+    @contextmanager
+    def _measure(self, name: str):
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self._add(name, perf_counter() - start)
+
+    def _measure_iter(self, name: str, iterable: Iterable[T]) -> Iterator[T]:
+        elapsed = 0.0
+        iterator = iter(iterable)
+        try:
+            while True:
+                start = perf_counter()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+                finally:
+                    elapsed += perf_counter() - start
+                yield item
+        finally:
+            self._add(name, elapsed)
+
+    def _add(self, name: str, elapsed: float) -> None:
+        with self._lock:
+            stage = self._stages.setdefault(name, [0.0, 0])
+            stage[0] += elapsed
+            stage[1] += 1
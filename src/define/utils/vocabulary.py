@@ -0,0 +1,105 @@
+import sqlite3
+from typing import Dict, Iterable, List, Optional, Set
+
+from define.utils.config_manager import ConfigManager
+from define.utils.response_cache import ResponseCache
+from define.utils.singleton import SingletonMeta
+from define.utils.sqlite_connection import SQLiteConnection
+
+
+class Vocabulary(metaclass=SingletonMeta):
+    """Palavras já vistas (headwords, stems e sugestões da API) (tabela words de ~/.Define/cache.db)
+
+    Base dos índices locais de palavras (sugestões de grafia e autocomplete).
+    Gravar não carrega a tabela; ela só vai para a memória quando algum índice
+    a lê. Se ainda estiver vazia, é semeada com as respostas do cache em disco.
+    """
+
+    # Headwords/stems absurdamente longos não servem para sugestão
+    MAX_WORD_LENGTH = 64
+
+    def __init__(self):
+        config = ConfigManager()
+        self.enabled = bool(config.get_value("Cache Enabled", True))
+        self.path = config.config_dir / "cache.db"
+        self._db = SQLiteConnection(self.path, ["CREATE TABLE IF NOT EXISTS words (word TEXT PRIMARY KEY)"])
+        self._words: Optional[List[str]] = None
+        self._known: Set[str] = set()
+
+    def add_words(self, words: Iterable[str]) -> None:
+        """Grava palavras novas (ignora vazias e repetidas)"""
+        if not self.enabled:
+            return
+
+        words = {w.strip() for w in words if isinstance(w, str)}
+        words = [w for w in words if w and len(w) <= self.MAX_WORD_LENGTH]
+        if not words:
+            return
+
+        try:
+            with self._db.lock:
+                if self._words is not None:
+                    new = [w for w in words if w not in self._known]
+                    self._known.update(new)
+                    self._words.extend(sorted(new))
+
+                self._db.connect().executemany("INSERT OR IGNORE INTO words (word) VALUES (?)", ((w,) for w in words))
+        except sqlite3.Error:
+            return
+
+    def add_raw_entries(self, raw_entries: Iterable[Dict]) -> None:
+        """Grava headword (hwi.hw) e stems (meta.stems) de entradas brutas da API"""
+        words = []
+        for entry in raw_entries:
+            if not isinstance(entry, dict):
+                continue
+
+            headword = entry.get('hwi', {}).get('hw', '')
+            if headword:
+                words.append(headword.replace('*', ''))
+            words.extend(entry.get('meta', {}).get('stems', []))
+
+        self.add_words(words)
+
+    def words(self, start: int = 0) -> List[str]:
+        """
+        Palavras conhecidas em ordem de inserção, a partir de `start`.
+
+        Índices guardam quantas já consumiram e pedem só as novas.
+        """
+        if not self.enabled:
+            return []
+
+        with self._db.lock:
+            loaded = self._words is not None
+
+        if not loaded and self._is_empty():
+            self._import_cached_responses()
+
+        try:
+            with self._db.lock:
+                if self._words is None:
+                    rows = self._db.connect().execute("SELECT word FROM words ORDER BY rowid").fetchall()
+                    self._words = [row[0] for row in rows]
+                    self._known = set(self._words)
+                return self._words[start:]
+        except sqlite3.Error:
+            return []
+
+    def _is_empty(self) -> bool:
+        try:
+            with self._db.lock:
+                return self._db.connect().execute("SELECT 1 FROM words LIMIT 1").fetchone() is None
+        except sqlite3.Error:
+            return False
+
+    def _import_cached_responses(self) -> None:
+        """Semeia a tabela com headwords, stems e sugestões das respostas já em cache"""
+        cache = ResponseCache.from_config(ConfigManager())
+        if cache is None:
+            return
+
+        for value in cache.iter_values():
+            if isinstance(value, list):
+                self.add_raw_entries(value)
+                self.add_words(item for item in value if isinstance(item, str))
@@ -0,0 +1,23 @@
+import sys
+from typing import Iterator
+
+
+def read_word_list(source: str) -> Iterator[str]:
+    """Lê palavras (uma por linha) de um arquivo ou do stdin ("-")
+
+    Linhas vazias e comentários iniciados por '#' são ignorados. A leitura
+    é preguiçosa, então listas enormes não são carregadas em memória.
+    """
+    if source == "-":
+        yield from _iter_words(sys.stdin)
+        return
+
+    with open(source, "r", encoding="utf-8") as f:
+        yield from _iter_words(f)
+
+
+def _iter_words(lines) -> Iterator[str]:
+    for line in lines:
+        word = line.strip()
+        if word and not word.startswith("#"):
+            yield word